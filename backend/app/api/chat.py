@@ -2,10 +2,12 @@
 """API endpoints for chat/conversation with the infrastructure assistant."""
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.core.chat import (
-    process_chat_message,
+    process_chat_message_async,
+    process_chat_message_stream,
     get_or_create_conversation,
     clear_conversation,
 )
@@ -54,7 +56,7 @@ async def start_chat() -> StartResponse:
 @router.post("/message", response_model=MessageResponse)
 async def send_message(request: MessageRequest) -> MessageResponse:
     """Send a message and get AI response."""
-    conversation, response, spec = process_chat_message(
+    conversation, response, spec = await process_chat_message_async(
         request.session_id,
         request.message,
     )
@@ -67,6 +69,15 @@ async def send_message(request: MessageRequest) -> MessageResponse:
     )
 
 
+@router.post("/message/stream")
+async def send_message_stream(request: MessageRequest) -> StreamingResponse:
+    """Send a message and stream the AI response as plain-text chunks."""
+    return StreamingResponse(
+        process_chat_message_stream(request.session_id, request.message),
+        media_type="text/plain",
+    )
+
+
 @router.post("/reset", response_model=ResetResponse)
 async def reset_chat(request: ResetRequest) -> ResetResponse:
     """Reset/clear a chat session."""
@@ -1,6 +1,7 @@
 # app/api/topologies.py
 """API endpoints for topology operations."""
 
+import asyncio
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
@@ -237,8 +238,9 @@ async def generate_topology(request: GenerateRequest) -> GenerateResponse:
 
         # Add cost estimate to topology metadata
         from app.core.pricing import estimate_topology_cost
-        cost_estimate = estimate_topology_cost(topology)
-        
+        # Run blocking Pricing API calls off the event loop
+        cost_estimate = await asyncio.to_thread(estimate_topology_cost, topology)
+
         # Add cost to metadata
         if topology.metadata is None:
             topology.metadata = {}
@@ -331,8 +333,9 @@ async def generate_from_spec(request: GenerateFromSpecRequest) -> GenerateRespon
 
         # Add cost estimate to topology metadata
         from app.core.pricing import estimate_topology_cost
-        cost_estimate = estimate_topology_cost(topology)
-        
+        # Run blocking Pricing API calls off the event loop
+        cost_estimate = await asyncio.to_thread(estimate_topology_cost, topology)
+
         # Add cost to metadata
         if topology.metadata is None:
             topology.metadata = {}
@@ -472,9 +475,9 @@ class CostEstimateResponse(BaseModel):
 async def estimate_cost(request: CostEstimateRequest) -> CostEstimateResponse:
     """Estimate monthly cost for a topology."""
     from app.core.pricing import estimate_topology_cost
-    
-    cost_data = estimate_topology_cost(request.topology)
-    
+
+    cost_data = await asyncio.to_thread(estimate_topology_cost, request.topology)
+
     return CostEstimateResponse(
         items=[CostItem(**item) for item in cost_data["items"]],
         hourly_total=cost_data["hourly_total"],
@@ -1,7 +1,10 @@
 # app/core/builder.py
 """Build TopologyGraph from TopologySpec - pure, deterministic logic."""
 
+import re
+
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from app.core.types import (
@@ -15,26 +18,120 @@ from app.core.types import (
 from app.core.spec import ComponentRole, ComponentSpec, TopologySpec
 
 
+# Keyword tables for complexity-tier detection, built once at import time
+_TIER2_KEYWORDS = (
+    "production", "high availability", "ha", "multi-az",
+    "load balancer", "redundant", "fault tolerant", "highly available",
+)
+_TIER1_KEYWORDS = (
+    "simple", "cheap", "small", "test", "mvp", "hobby",
+    "learning", "personal", "basic", "minimal",
+)
+
+# Single-alternation regexes scan the text once instead of once per keyword;
+# IGNORECASE avoids allocating lowered copies of the descriptions
+_TIER2_RE = re.compile("|".join(map(re.escape, _TIER2_KEYWORDS)), re.IGNORECASE)
+_TIER1_RE = re.compile("|".join(map(re.escape, _TIER1_KEYWORDS)), re.IGNORECASE)
+
+
+def _scan_tier(text: str) -> int:
+    """Scan combined component descriptions and return the complexity tier."""
+    # Check for TIER 2 triggers first (production-grade infrastructure)
+    if _TIER2_RE.search(text):
+        return 2
+    # Check for TIER 1 triggers (explicitly cheap/simple)
+    if _TIER1_RE.search(text):
+        return 1
+    # DEFAULT TO TIER 1 (hobby/learning mode)
+    return 1
+
+
+def _tcp_rule(port: int, *, cidrs: list[str] | None = None, sg: str | None = None) -> dict[str, Any]:
+    """Build a single-port TCP security-group rule."""
+    rule: dict[str, Any] = {"from_port": port, "to_port": port, "protocol": "tcp"}
+    if cidrs is not None:
+        rule["cidr_blocks"] = cidrs
+    if sg is not None:
+        rule["source_security_group"] = sg
+    return rule
+
+
+# Common rules shared by the security-group helpers. Builds deep-copy the
+# cached graph before returning it, so these templates are never mutated.
+_INGRESS_HTTP = _tcp_rule(80, cidrs=["0.0.0.0/0"])
+_INGRESS_HTTPS = _tcp_rule(443, cidrs=["0.0.0.0/0"])
+_INGRESS_SSH = _tcp_rule(22, cidrs=["0.0.0.0/0"])
+_EGRESS_ALL = {"from_port": 0, "to_port": 0, "protocol": "-1", "cidr_blocks": ["0.0.0.0/0"]}
+
+# Shared rule lists; safe because builds deep-copy the cached graph
+_EGRESS_ALL_RULES = [_EGRESS_ALL]
+_OPEN_WEB_INGRESS = [_INGRESS_HTTP, _INGRESS_HTTPS, _INGRESS_SSH]
+_ALB_INGRESS = [_INGRESS_HTTP, _INGRESS_HTTPS]
+
+# Base tags merged into every node's tags
+_BASE_TAGS = {"ManagedBy": "TopNet"}
+
+
 class TopologyBuilder:
     """Builds a TopologyGraph from a TopologySpec."""
 
+    __slots__ = (
+        "spec",
+        "nodes",
+        "_node_index",
+        "_edge_tuples",
+        "subnet_counter",
+        "vpc_id",
+        "igw_id",
+        "nat_id",
+        "public_subnet_ids",
+        "private_subnet_ids",
+        "_private_subnets_by_tier",
+        "_az_cache",
+        "web_sg_id",
+        "db_sg_id",
+        "alb_sg_id",
+        "complexity_tier",
+        "has_web_tier",
+        "has_db_tier",
+        "_qty_by_role",
+        "_constraints_by_role",
+    )
+
     def __init__(self, spec: TopologySpec):
         self.spec = spec
         self.nodes: list[BaseNode] = []
-        self.edges: list[Edge] = []
+        self._node_index: dict[str, BaseNode] = {}
+        # Edges accumulate as (kind, from, to, props) tuples; ids are
+        # assigned sequentially when the Edge models are materialized
+        self._edge_tuples: list[tuple] = []
         self.subnet_counter = 0
-        self.edge_counter = 0
         self.vpc_id: str | None = None
         self.igw_id: str | None = None
         self.nat_id: str | None = None
         self.public_subnet_ids: list[str] = []
         self.private_subnet_ids: list[str] = []
+        self._private_subnets_by_tier: dict[str, list[str]] = {}
+        self._az_cache: dict[int, list[str]] = {}
         self.web_sg_id: str | None = None
         self.db_sg_id: str | None = None
         self.alb_sg_id: str | None = None
 
-        # Detect complexity tier (1=hobby, 2=production)
+        # Detect complexity tier (1=hobby, 2=production) and index the
+        # components by role in a single pass; the spec never mutates during
+        # a build, so quantities and constraints are resolved once here
         self.complexity_tier = self._detect_complexity_tier()
+        self._qty_by_role: dict[ComponentRole, int] = {}
+        self._constraints_by_role: dict[ComponentRole, dict[str, Any]] = {}
+        roles_seen: set[ComponentRole] = set()
+        for comp in spec.components:
+            roles_seen.add(comp.role)
+            if comp.quantity and comp.role not in self._qty_by_role:
+                self._qty_by_role[comp.role] = comp.quantity
+            if comp.constraints and comp.role not in self._constraints_by_role:
+                self._constraints_by_role[comp.role] = comp.constraints
+        self.has_web_tier = ComponentRole.WEB_TIER in roles_seen
+        self.has_db_tier = ComponentRole.DB_TIER in roles_seen
 
     def _detect_complexity_tier(self) -> int:
         """
@@ -54,39 +151,35 @@ class TopologyBuilder:
         Returns:
             1 for TIER 1 (hobby), 2 for TIER 2 (production)
         """
-        # Combine all component descriptions for keyword analysis
-        all_text = " ".join([
-            (c.description or "").lower()
+        # Combine all component descriptions for keyword analysis.
+        # If user doesn't explicitly ask for production, _scan_tier defaults
+        # to TIER 1 (the cheapest architecture).
+        all_text = " ".join(
+            c.description or ""
             for c in self.spec.components
-        ]).lower()
-
-        # TIER 2 triggers (production-grade infrastructure)
-        tier2_keywords = [
-            "production", "high availability", "ha", "multi-az",
-            "load balancer", "redundant", "fault tolerant", "highly available"
-        ]
-
-        # TIER 1 triggers (explicitly cheap/simple)
-        tier1_keywords = [
-            "simple", "cheap", "small", "test", "mvp", "hobby",
-            "learning", "personal", "basic", "minimal"
-        ]
-
-        # Check for TIER 2 triggers first
-        if any(kw in all_text for kw in tier2_keywords):
-            return 2
+        )
+        return _scan_tier(all_text)
 
-        # Check for TIER 1 triggers
-        if any(kw in all_text for kw in tier1_keywords):
-            return 1
+    def build(self) -> TopologyGraph:
+        """Build the complete topology graph from spec.
 
-        # DEFAULT TO TIER 1 (hobby/learning mode)
-        # This is critical: if user doesn't explicitly ask for production,
-        # we default to the cheapest architecture
-        return 1
+        Identical specs reuse a cached graph (deep-copied so callers can
+        mutate freely); the id and created_at are refreshed per call.
+        """
+        graph = _build_cached(self.spec.model_dump_json()).model_copy(deep=True)
+        # Format the timestamp directly; strftime re-parses its format string
+        # on every call
+        now = datetime.now(timezone.utc)
+        graph.id = (
+            f"topo-{now.year:04d}{now.month:02d}{now.day:02d}"
+            f"{now.hour:02d}{now.minute:02d}{now.second:02d}"
+        )
+        if graph.metadata is not None:
+            graph.metadata["created_at"] = now.isoformat()
+        return graph
 
-    def build(self) -> TopologyGraph:
-        """Build the complete topology graph from spec."""
+    def _build(self) -> TopologyGraph:
+        """Build the graph without consulting the cache."""
         # Route to appropriate build method based on complexity tier
         if self.complexity_tier == 1:
             return self._build_tier1()
@@ -117,9 +210,9 @@ class TopologyBuilder:
         # Simple route table (IGW only, no NAT)
         self._create_simple_route_table()
 
-        # Analyze what components we need
-        has_web_tier = any(c.role == ComponentRole.WEB_TIER for c in self.spec.components)
-        has_db_tier = any(c.role == ComponentRole.DB_TIER for c in self.spec.components)
+        # Component shape was precomputed in __init__
+        has_web_tier = self.has_web_tier
+        has_db_tier = self.has_db_tier
 
         # Create security groups
         if has_web_tier:
@@ -137,19 +230,7 @@ class TopologyBuilder:
         if has_db_tier:
             self._create_simple_rds()
 
-        return TopologyGraph(
-            id=f"topo-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}",
-            name=f"TIER 1 Topology - {self.spec.region}",
-            nodes=self.nodes,
-            edges=self.edges,
-            metadata={
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "version": "0.1.0",
-                "complexity_tier": 1,
-                "mode": "tier1_hobby",
-                "spec": self.spec.model_dump(),
-            },
-        )
+        return self._finalize_graph(1, "tier1_hobby", f"TIER 1 Topology - {self.spec.region}")
     
     def _build_tier2(self) -> TopologyGraph:
         """
@@ -169,82 +250,84 @@ class TopologyBuilder:
         self._create_vpc()
         self._create_internet_gateway()
 
-        # Analyze components to determine what to create
-        has_web_tier = any(c.role == ComponentRole.WEB_TIER for c in self.spec.components)
-        has_db_tier = any(c.role == ComponentRole.DB_TIER for c in self.spec.components)
-        web_quantity = self._get_quantity(ComponentRole.WEB_TIER)
-        db_quantity = self._get_quantity(ComponentRole.DB_TIER)
+        # Component shape was precomputed in __init__. With neither tier
+        # there is nothing beyond the VPC and IGW to create, so skip the
+        # subnet/route-table/security-group machinery entirely.
+        has_web_tier = self.has_web_tier
+        has_db_tier = self.has_db_tier
+        if has_web_tier or has_db_tier:
+            web_quantity = self._get_quantity(ComponentRole.WEB_TIER)
+            db_quantity = self._get_quantity(ComponentRole.DB_TIER)
 
-        # Create subnets across 2 AZs for HA
-        num_azs = 2
+            # Create subnets across 2 AZs for HA
+            num_azs = 2
 
-        if has_web_tier:
-            # Create public subnets for ALB
-            self._create_public_subnets(num_azs)
-            # Create private subnets for web tier
-            self._create_private_subnets(num_azs, tier="web")
-            # Create NAT Gateway for outbound traffic from private subnets
-            self._create_nat_gateway()
+            # Public subnets for ALB, private subnets for the web and db
+            # tiers, all emitted in a single pass over the AZs
+            plan: list[tuple[str, bool]] = []
+            if has_web_tier:
+                plan += [("public", True), ("web", False)]
+            if has_db_tier:
+                plan.append(("db", False))
+            self._create_all_subnets(num_azs, plan)
 
-        if has_db_tier:
-            # Create private database subnets
-            self._create_private_subnets(num_azs, tier="db")
+            if has_web_tier:
+                # Create NAT Gateway for outbound traffic from private subnets
+                self._create_nat_gateway()
 
-        # Create route tables
-        self._create_route_tables()
+            # Create route tables
+            self._create_route_tables()
 
-        # Create security groups
-        if has_web_tier:
-            self._create_alb_security_group()
-            self._create_web_security_group()
+            # Create security groups
+            if has_web_tier:
+                self._create_alb_security_group()
+                self._create_web_security_group()
 
-        if has_db_tier:
-            self._create_db_security_group()
+            if has_db_tier:
+                self._create_db_security_group()
 
-        # Create Application Load Balancer
-        if has_web_tier:
-            self._create_alb()
+            # Create Application Load Balancer
+            if has_web_tier:
+                self._create_alb()
 
-        # Create EC2 instances for web tier (in private subnets)
-        if has_web_tier:
-            self._create_web_instances(web_quantity)
+            # Create EC2 instances for web tier (in private subnets)
+            if has_web_tier:
+                self._create_web_instances(web_quantity)
 
-        # Create RDS database (in private subnets)
-        if has_db_tier:
-            self._create_rds(db_quantity)
+            # Create RDS database (in private subnets)
+            if has_db_tier:
+                self._create_rds(db_quantity)
+
+        return self._finalize_graph(2, "tier2_production", f"TIER 2 Topology - {self.spec.region}")
 
+    def _finalize_graph(self, tier: int, mode: str, name: str) -> TopologyGraph:
+        """Assemble the TopologyGraph shared by both tier builders."""
+        now = datetime.now(timezone.utc)
         return TopologyGraph(
-            id=f"topo-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}",
-            name=f"TIER 2 Topology - {self.spec.region}",
+            id=f"topo-{now.strftime('%Y%m%d%H%M%S')}",
+            name=name,
             nodes=self.nodes,
-            edges=self.edges,
+            edges=self._materialize_edges(),
             metadata={
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "created_at": now.isoformat(),
                 "version": "0.1.0",
-                "complexity_tier": 2,
-                "mode": "tier2_production",
+                "complexity_tier": tier,
+                "mode": mode,
                 "spec": self.spec.model_dump(),
             },
         )
 
     def _get_quantity(self, role: ComponentRole) -> int:
         """Get quantity for a component role, defaulting to sensible values."""
-        for comp in self.spec.components:
-            if comp.role == role and comp.quantity:
-                return comp.quantity
-        # Defaults
-        if role == ComponentRole.WEB_TIER:
-            return 2  # 2 instances for HA
-        if role == ComponentRole.DB_TIER:
-            return 1
-        return 1
+        qty = self._qty_by_role.get(role)
+        if qty:
+            return qty
+        # Defaults (2 web instances for HA)
+        return 2 if role is ComponentRole.WEB_TIER else 1
 
     def _get_constraints(self, role: ComponentRole) -> dict[str, Any]:
         """Get constraints for a component role."""
-        for comp in self.spec.components:
-            if comp.role == role and comp.constraints:
-                return comp.constraints
-        return {}
+        return self._constraints_by_role.get(role, {})
 
     def _next_subnet_cidr(self) -> str:
         """Allocate next subnet CIDR block."""
@@ -252,32 +335,27 @@ class TopologyBuilder:
         self.subnet_counter += 1
         return cidr
 
-    def _next_edge_id(self) -> str:
-        """Generate next edge ID."""
-        self.edge_counter += 1
-        return f"e{self.edge_counter}"
-
     def _add_node(self, node: BaseNode) -> None:
         """Add a node to the graph."""
+        self._node_index[node.id] = node
         self.nodes.append(node)
 
     def _add_edge(self, kind: EdgeKind, from_node: str, to_node: str, props: dict | None = None) -> None:
         """Add an edge to the graph."""
-        self.edges.append(
-            Edge(
-                id=self._next_edge_id(),
-                kind=kind,
-                from_node=from_node,
-                to_node=to_node,
-                props=props,
-            )
-        )
+        self._edge_tuples.append((kind, from_node, to_node, props))
+
+    def _materialize_edges(self) -> list[Edge]:
+        """Convert the accumulated edge tuples into Edge models with sequential ids."""
+        return [
+            Edge.model_construct(id=f"e{i}", kind=kind, from_node=from_, to_node=to, props=props)
+            for i, (kind, from_, to, props) in enumerate(self._edge_tuples, 1)
+        ]
 
     def _create_vpc(self) -> None:
         """Create the VPC node."""
         self.vpc_id = "vpc-main"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.vpc_id,
                 kind=NodeKind.NETWORK,
                 name="main-vpc",
@@ -288,7 +366,7 @@ class TopologyBuilder:
                     "enable_dns_hostnames": True,
                     "enable_dns_support": True,
                 },
-                tags={"Name": "topnet-vpc", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-vpc"},
             )
         )
 
@@ -296,14 +374,14 @@ class TopologyBuilder:
         """Create the Internet Gateway."""
         self.igw_id = "igw-main"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.igw_id,
                 kind=NodeKind.GATEWAY,
                 name="main-igw",
                 provider=Provider.AWS,
                 region=self.spec.region,
                 props={"gateway_type": "internet"},
-                tags={"Name": "topnet-igw", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-igw"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.igw_id, self.vpc_id)
@@ -316,7 +394,7 @@ class TopologyBuilder:
         subnet_id = "subnet-public"
         self.public_subnet_ids.append(subnet_id)
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=subnet_id,
                 kind=NodeKind.SUBNET,
                 name="public-subnet",
@@ -328,7 +406,7 @@ class TopologyBuilder:
                     "is_public": True,
                     "map_public_ip_on_launch": True,
                 },
-                tags={"Name": "topnet-public", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-public"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, subnet_id, self.vpc_id)
@@ -337,16 +415,16 @@ class TopologyBuilder:
         """Create a simple route table pointing to IGW."""
         rt_id = "rt-main"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=rt_id,
                 kind=NodeKind.ROUTE_TABLE,
                 name="main-rt",
                 provider=Provider.AWS,
                 region=self.spec.region,
                 props={
-                    "routes": [{"destination": "0.0.0.0/0", "target": self.igw_id}],
+                    "routes": ({"destination": "0.0.0.0/0", "target": self.igw_id},),
                 },
-                tags={"Name": "topnet-rt", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-rt"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, rt_id, self.vpc_id)
@@ -356,7 +434,7 @@ class TopologyBuilder:
         """Create a simple security group for basic web access."""
         self.web_sg_id = "sg-web"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.web_sg_id,
                 kind=NodeKind.SECURITY_GROUP,
                 name="web-sg",
@@ -364,16 +442,10 @@ class TopologyBuilder:
                 region=self.spec.region,
                 props={
                     "description": "Security group for web access",
-                    "ingress": [
-                        {"from_port": 80, "to_port": 80, "protocol": "tcp", "cidr_blocks": ["0.0.0.0/0"]},
-                        {"from_port": 443, "to_port": 443, "protocol": "tcp", "cidr_blocks": ["0.0.0.0/0"]},
-                        {"from_port": 22, "to_port": 22, "protocol": "tcp", "cidr_blocks": ["0.0.0.0/0"]},
-                    ],
-                    "egress": [
-                        {"from_port": 0, "to_port": 0, "protocol": "-1", "cidr_blocks": ["0.0.0.0/0"]},
-                    ],
+                    "ingress": _OPEN_WEB_INGRESS,
+                    "egress": _EGRESS_ALL_RULES,
                 },
-                tags={"Name": "topnet-web-sg", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-web-sg"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.web_sg_id, self.vpc_id)
@@ -382,25 +454,26 @@ class TopologyBuilder:
         """Create EC2 instances in public subnet (TIER 1 mode)."""
         constraints = self._get_constraints(ComponentRole.WEB_TIER)
         instance_type = constraints.get("instance_type", "t3.micro")
+        region = self.spec.region
 
         for i in range(quantity):
             ec2_id = f"ec2-{i + 1}" if quantity > 1 else "ec2-instance"
             ec2_name = f"instance-{i + 1}" if quantity > 1 else "web-instance"
             self._add_node(
-                BaseNode(
+                BaseNode.model_construct(
                     id=ec2_id,
                     kind=NodeKind.COMPUTE_INSTANCE,
                     name=ec2_name,
                     provider=Provider.AWS,
-                    region=self.spec.region,
-                    az=f"{self.spec.region}a",
+                    region=region,
+                    az=f"{region}a",
                     props={
                         "instance_type": instance_type,
                         "subnet_id": self.public_subnet_ids[0],
-                        "security_groups": [self.web_sg_id],
+                        "security_groups": (self.web_sg_id,),
                         "associate_public_ip": True,
                     },
-                    tags={"Name": f"topnet-{ec2_name}", "ManagedBy": "TopNet"},
+                    tags={**_BASE_TAGS, "Name": f"topnet-{ec2_name}"},
                 )
             )
             self._add_edge(EdgeKind.ATTACHED_TO, ec2_id, self.public_subnet_ids[0])
@@ -419,15 +492,10 @@ class TopologyBuilder:
         ingress_rules = []
         if self.web_sg_id:
             # Allow database access from web security group
-            ingress_rules.append({
-                "from_port": db_port,
-                "to_port": db_port,
-                "protocol": "tcp",
-                "source_security_group": self.web_sg_id,
-            })
+            ingress_rules.append(_tcp_rule(db_port, sg=self.web_sg_id))
 
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.db_sg_id,
                 kind=NodeKind.SECURITY_GROUP,
                 name="db-sg",
@@ -438,7 +506,7 @@ class TopologyBuilder:
                     "ingress": ingress_rules,
                     "egress": [],  # No outbound by default
                 },
-                tags={"Name": "topnet-db-sg", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-db-sg"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.db_sg_id, self.vpc_id)
@@ -469,7 +537,7 @@ class TopologyBuilder:
 
         rds_id = "rds-main"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=rds_id,
                 kind=NodeKind.DATABASE,
                 name="main-db",
@@ -481,65 +549,59 @@ class TopologyBuilder:
                     "engine_version": engine_version,
                     "instance_class": instance_class,
                     "allocated_storage": storage,
-                    "subnet_ids": self.public_subnet_ids,  # Public subnet for TIER 1
-                    "security_groups": [self.db_sg_id],
+                    "subnet_ids": tuple(self.public_subnet_ids),  # Public subnet for TIER 1
+                    "security_groups": (self.db_sg_id,),
                     "multi_az": False,  # Single AZ for cost savings
                     "publicly_accessible": False,  # Still not publicly accessible
                 },
-                tags={"Name": "topnet-db", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-db"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, rds_id, self.public_subnet_ids[0])
 
     # ========== FULL MODE METHODS ==========
 
-    def _create_public_subnets(self, num_azs: int) -> None:
-        """Create public subnets across AZs."""
-        azs = self._get_azs(num_azs)
-        for i, az in enumerate(azs):
-            subnet_id = f"subnet-public-{i + 1}"
-            self.public_subnet_ids.append(subnet_id)
-            self._add_node(
-                BaseNode(
-                    id=subnet_id,
-                    kind=NodeKind.SUBNET,
-                    name=f"public-subnet-{i + 1}",
-                    provider=Provider.AWS,
-                    region=self.spec.region,
-                    az=az,
-                    props={
-                        "cidr_block": self._next_subnet_cidr(),
-                        "is_public": True,
-                        "map_public_ip_on_launch": True,
-                    },
-                    tags={"Name": f"topnet-public-{i + 1}", "Tier": "public", "ManagedBy": "TopNet"},
-                )
-            )
-            self._add_edge(EdgeKind.ATTACHED_TO, subnet_id, self.vpc_id)
+    def _create_all_subnets(self, num_azs: int, plan: list[tuple[str, bool]]) -> None:
+        """Create all subnets for the build in a single pass over the AZs.
 
-    def _create_private_subnets(self, num_azs: int, tier: str = "private") -> None:
-        """Create private subnets across AZs."""
+        `plan` is a list of `(tier, is_public)` entries; each tier gets one
+        subnet per AZ. Fusing the tiers into one loop walks the AZ list once
+        instead of once per tier.
+        """
         azs = self._get_azs(num_azs)
-        for i, az in enumerate(azs):
-            subnet_id = f"subnet-{tier}-{i + 1}"
-            self.private_subnet_ids.append(subnet_id)
-            self._add_node(
-                BaseNode(
-                    id=subnet_id,
-                    kind=NodeKind.SUBNET,
-                    name=f"{tier}-subnet-{i + 1}",
-                    provider=Provider.AWS,
-                    region=self.spec.region,
-                    az=az,
-                    props={
-                        "cidr_block": self._next_subnet_cidr(),
-                        "is_public": False,
-                        "map_public_ip_on_launch": False,
-                    },
-                    tags={"Name": f"topnet-{tier}-{i + 1}", "Tier": tier, "ManagedBy": "TopNet"},
+        region = self.spec.region
+        new_nodes: list[BaseNode] = []
+        new_edges: list[tuple] = []
+        for tier, is_public in plan:
+            for i, az in enumerate(azs):
+                n = str(i + 1)
+                subnet_id = f"subnet-{tier}-" + n
+                if is_public:
+                    self.public_subnet_ids.append(subnet_id)
+                else:
+                    self.private_subnet_ids.append(subnet_id)
+                    self._private_subnets_by_tier.setdefault(tier, []).append(subnet_id)
+                new_nodes.append(
+                    BaseNode.model_construct(
+                        id=subnet_id,
+                        kind=NodeKind.SUBNET,
+                        name=(tier + "-subnet-" + n) if not is_public else ("public-subnet-" + n),
+                        provider=Provider.AWS,
+                        region=region,
+                        az=az,
+                        props={
+                            "cidr_block": self._next_subnet_cidr(),
+                            "is_public": is_public,
+                            "map_public_ip_on_launch": is_public,
+                        },
+                        tags={**_BASE_TAGS, "Name": f"topnet-{tier}-" + n, "Tier": tier},
+                    )
                 )
-            )
-            self._add_edge(EdgeKind.ATTACHED_TO, subnet_id, self.vpc_id)
+                new_edges.append((EdgeKind.ATTACHED_TO, subnet_id, self.vpc_id, None))
+        # Flush the batch with one extend per list instead of per-item appends
+        self._node_index.update((n.id, n) for n in new_nodes)
+        self.nodes.extend(new_nodes)
+        self._edge_tuples.extend(new_edges)
 
     def _create_nat_gateway(self) -> None:
         """Create NAT Gateway in first public subnet."""
@@ -547,12 +609,12 @@ class TopologyBuilder:
             return
         
         # Find the AZ of the first public subnet
-        subnet_node = next((n for n in self.nodes if n.id == self.public_subnet_ids[0]), None)
+        subnet_node = self._node_index.get(self.public_subnet_ids[0])
         nat_az = subnet_node.az if subnet_node else None
         
         self.nat_id = "nat-main"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.nat_id,
                 kind=NodeKind.GATEWAY,
                 name="nat-gateway",
@@ -563,7 +625,7 @@ class TopologyBuilder:
                     "gateway_type": "nat",
                     "subnet_id": self.public_subnet_ids[0],
                 },
-                tags={"Name": "topnet-nat", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-nat"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.nat_id, self.public_subnet_ids[0])
@@ -573,16 +635,16 @@ class TopologyBuilder:
         # Public route table -> IGW
         rt_public_id = "rt-public"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=rt_public_id,
                 kind=NodeKind.ROUTE_TABLE,
                 name="public-rt",
                 provider=Provider.AWS,
                 region=self.spec.region,
                 props={
-                    "routes": [{"destination": "0.0.0.0/0", "target": self.igw_id}],
+                    "routes": ({"destination": "0.0.0.0/0", "target": self.igw_id},),
                 },
-                tags={"Name": "topnet-public-rt", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-public-rt"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, rt_public_id, self.vpc_id)
@@ -592,16 +654,16 @@ class TopologyBuilder:
         if self.nat_id:
             rt_private_id = "rt-private"
             self._add_node(
-                BaseNode(
+                BaseNode.model_construct(
                     id=rt_private_id,
                     kind=NodeKind.ROUTE_TABLE,
                     name="private-rt",
                     provider=Provider.AWS,
                     region=self.spec.region,
                     props={
-                        "routes": [{"destination": "0.0.0.0/0", "target": self.nat_id}],
+                        "routes": ({"destination": "0.0.0.0/0", "target": self.nat_id},),
                     },
-                    tags={"Name": "topnet-private-rt", "ManagedBy": "TopNet"},
+                    tags={**_BASE_TAGS, "Name": "topnet-private-rt"},
                 )
             )
             self._add_edge(EdgeKind.ATTACHED_TO, rt_private_id, self.vpc_id)
@@ -611,7 +673,7 @@ class TopologyBuilder:
         """Create security group for ALB."""
         self.alb_sg_id = "sg-alb"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.alb_sg_id,
                 kind=NodeKind.SECURITY_GROUP,
                 name="alb-sg",
@@ -619,15 +681,10 @@ class TopologyBuilder:
                 region=self.spec.region,
                 props={
                     "description": "Security group for Application Load Balancer",
-                    "ingress": [
-                        {"from_port": 80, "to_port": 80, "protocol": "tcp", "cidr_blocks": ["0.0.0.0/0"]},
-                        {"from_port": 443, "to_port": 443, "protocol": "tcp", "cidr_blocks": ["0.0.0.0/0"]},
-                    ],
-                    "egress": [
-                        {"from_port": 0, "to_port": 0, "protocol": "-1", "cidr_blocks": ["0.0.0.0/0"]},
-                    ],
+                    "ingress": _ALB_INGRESS,
+                    "egress": _EGRESS_ALL_RULES,
                 },
-                tags={"Name": "topnet-alb-sg", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-alb-sg"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.alb_sg_id, self.vpc_id)
@@ -636,7 +693,7 @@ class TopologyBuilder:
         """Create security group for web tier."""
         self.web_sg_id = "sg-web"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.web_sg_id,
                 kind=NodeKind.SECURITY_GROUP,
                 name="web-sg",
@@ -645,15 +702,13 @@ class TopologyBuilder:
                 props={
                     "description": "Security group for web tier",
                     "ingress": [
-                        {"from_port": 80, "to_port": 80, "protocol": "tcp", "source_security_group": self.alb_sg_id},
-                        {"from_port": 443, "to_port": 443, "protocol": "tcp", "source_security_group": self.alb_sg_id},
-                        {"from_port": 22, "to_port": 22, "protocol": "tcp", "cidr_blocks": ["10.0.0.0/16"]},  # SSH from VPC
-                    ],
-                    "egress": [
-                        {"from_port": 0, "to_port": 0, "protocol": "-1", "cidr_blocks": ["0.0.0.0/0"]},
+                        _tcp_rule(80, sg=self.alb_sg_id),
+                        _tcp_rule(443, sg=self.alb_sg_id),
+                        _tcp_rule(22, cidrs=["10.0.0.0/16"]),  # SSH from VPC
                     ],
+                    "egress": _EGRESS_ALL_RULES,
                 },
-                tags={"Name": "topnet-web-sg", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-web-sg"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.web_sg_id, self.vpc_id)
@@ -671,15 +726,10 @@ class TopologyBuilder:
         
         ingress_rules = []
         if self.web_sg_id:
-            ingress_rules.append({
-                "from_port": db_port,
-                "to_port": db_port,
-                "protocol": "tcp",
-                "source_security_group": self.web_sg_id,
-            })
+            ingress_rules.append(_tcp_rule(db_port, sg=self.web_sg_id))
         
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=self.db_sg_id,
                 kind=NodeKind.SECURITY_GROUP,
                 name="db-sg",
@@ -690,7 +740,7 @@ class TopologyBuilder:
                     "ingress": ingress_rules,
                     "egress": [],  # No outbound by default
                 },
-                tags={"Name": "topnet-db-sg", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-db-sg"},
             )
         )
         self._add_edge(EdgeKind.ATTACHED_TO, self.db_sg_id, self.vpc_id)
@@ -706,7 +756,7 @@ class TopologyBuilder:
         
         alb_id = "alb-web"
         self._add_node(
-            BaseNode(
+            BaseNode.model_construct(
                 id=alb_id,
                 kind=NodeKind.LOAD_BALANCER,
                 name="web-alb",
@@ -715,10 +765,10 @@ class TopologyBuilder:
                 props={
                     "lb_type": "application",
                     "scheme": "internet-facing",
-                    "subnets": self.public_subnet_ids,
-                    "security_groups": [self.alb_sg_id],
+                    "subnets": tuple(self.public_subnet_ids),
+                    "security_groups": (self.alb_sg_id,),
                 },
-                tags={"Name": "topnet-web-alb", "ManagedBy": "TopNet"},
+                tags={**_BASE_TAGS, "Name": "topnet-web-alb"},
             )
         )
         # ALB attached to public subnets
@@ -734,35 +784,40 @@ class TopologyBuilder:
         constraints = self._get_constraints(ComponentRole.WEB_TIER)
         instance_type = constraints.get("instance_type", "t3.micro")
         
-        # Distribute instances across private subnets
-        web_subnets = [s for s in self.private_subnet_ids if "web" in s]
-        if not web_subnets:
-            web_subnets = self.private_subnet_ids[:2]  # Use first 2 private subnets
-        
+        # Distribute instances across the web-tier private subnets
+        web_subnets = self._private_subnets_by_tier.get("web") or self.private_subnet_ids[:2]
+        region = self.spec.region
+
+        new_nodes: list[BaseNode] = []
+        new_edges: list[tuple] = []
         for i in range(quantity):
             subnet_id = web_subnets[i % len(web_subnets)]
             # Find AZ from subnet
-            subnet_node = next((n for n in self.nodes if n.id == subnet_id), None)
-            az = subnet_node.az if subnet_node else f"{self.spec.region}a"
-            
-            ec2_id = f"ec2-web-{i + 1}"
-            self._add_node(
-                BaseNode(
+            subnet_node = self._node_index.get(subnet_id)
+            az = subnet_node.az if subnet_node else f"{region}a"
+
+            n = str(i + 1)
+            ec2_id = "ec2-web-" + n
+            new_nodes.append(
+                BaseNode.model_construct(
                     id=ec2_id,
                     kind=NodeKind.COMPUTE_INSTANCE,
-                    name=f"web-server-{i + 1}",
+                    name="web-server-" + n,
                     provider=Provider.AWS,
-                    region=self.spec.region,
+                    region=region,
                     az=az,
                     props={
                         "instance_type": instance_type,
                         "subnet_id": subnet_id,
-                        "security_groups": [self.web_sg_id],
+                        "security_groups": (self.web_sg_id,),
                     },
-                    tags={"Name": f"topnet-web-{i + 1}", "Role": "web", "ManagedBy": "TopNet"},
+                    tags={**_BASE_TAGS, "Name": "topnet-web-" + n, "Role": "web"},
                 )
             )
-            self._add_edge(EdgeKind.ATTACHED_TO, ec2_id, subnet_id)
+            new_edges.append((EdgeKind.ATTACHED_TO, ec2_id, subnet_id, None))
+        self._node_index.update((n.id, n) for n in new_nodes)
+        self.nodes.extend(new_nodes)
+        self._edge_tuples.extend(new_edges)
 
     def _create_rds(self, quantity: int = 1) -> None:
         """Create RDS database instance."""
@@ -779,43 +834,56 @@ class TopologyBuilder:
         storage = constraints.get("allocated_storage", 20)
         
         # Find db subnets
-        db_subnets = [s for s in self.private_subnet_ids if "db" in s]
+        db_subnets = self._private_subnets_by_tier.get("db")
         if not db_subnets:
             db_subnets = self.private_subnet_ids[-2:] if len(self.private_subnet_ids) >= 2 else self.private_subnet_ids
         
+        region = self.spec.region
         for i in range(quantity):
             subnet_id = db_subnets[i % len(db_subnets)] if db_subnets else None
-            subnet_node = next((n for n in self.nodes if n.id == subnet_id), None) if subnet_id else None
-            az = subnet_node.az if subnet_node else f"{self.spec.region}a"
+            subnet_node = self._node_index.get(subnet_id) if subnet_id else None
+            az = subnet_node.az if subnet_node else f"{region}a"
             
-            rds_id = f"rds-{i + 1}"
+            n = str(i + 1)
+            rds_id = "rds-" + n
             self._add_node(
-                BaseNode(
+                BaseNode.model_construct(
                     id=rds_id,
                     kind=NodeKind.DATABASE,
-                    name=f"main-db-{i + 1}" if quantity > 1 else "main-db",
+                    name=("main-db-" + n) if quantity > 1 else "main-db",
                     provider=Provider.AWS,
-                    region=self.spec.region,
+                    region=region,
                     az=az,
                     props={
                         "engine": engine,
                         "engine_version": engine_version,
                         "instance_class": instance_class,
                         "allocated_storage": storage,
-                        "subnet_ids": db_subnets,
-                        "security_groups": [self.db_sg_id],
+                        "subnet_ids": tuple(db_subnets),
+                        "security_groups": (self.db_sg_id,),
                         "multi_az": False,
                     },
-                    tags={"Name": f"topnet-db-{i + 1}" if quantity > 1 else "topnet-db", "ManagedBy": "TopNet"},
+                    tags={**_BASE_TAGS, "Name": ("topnet-db-" + n) if quantity > 1 else "topnet-db"},
                 )
             )
             if subnet_id:
                 self._add_edge(EdgeKind.ATTACHED_TO, rds_id, subnet_id)
 
     def _get_azs(self, num_azs: int) -> list[str]:
-        """Get availability zones for the region."""
-        az_suffixes = ["a", "b", "c", "d", "e", "f"]
-        return [f"{self.spec.region}{az_suffixes[i]}" for i in range(num_azs)]
+        """Get availability zones for the region (cached per build)."""
+        azs = self._az_cache.get(num_azs)
+        if azs is None:
+            az_suffixes = ["a", "b", "c", "d", "e", "f"]
+            azs = [f"{self.spec.region}{az_suffixes[i]}" for i in range(num_azs)]
+            self._az_cache[num_azs] = azs
+        return azs
+
+
+@lru_cache(maxsize=128)
+def _build_cached(spec_json: str) -> TopologyGraph:
+    """Build (and cache) the graph for a canonical spec JSON string."""
+    builder = TopologyBuilder(TopologySpec.model_validate_json(spec_json))
+    return builder._build()
 
 
 def build_topology_from_spec(spec: TopologySpec) -> TopologyGraph:
@@ -1,37 +1,276 @@
 # app/core/chat.py
 """Chat/conversation manager for infrastructure planning."""
 
+import asyncio
+import hashlib
+import io
 import json
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from itertools import count
+
+from dataclasses import dataclass, field
 
 from app.core.spec import ComponentRole, ComponentSpec, TopologySpec
 
+# orjson parses/encodes in C and is noticeably faster on the small spec
+# payloads here; fall back to stdlib json when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(s: str) -> Any:
+        return orjson.loads(s)
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_indented(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:  # pragma: no cover - exercised only without orjson
+    def _json_loads(s: str) -> Any:
+        return json.loads(s)
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+    def _json_dumps_indented(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+# Message ids only need to be unique, not cryptographically random; a
+# process-unique prefix plus a counter avoids a getrandom syscall per
+# message
+_MSG_ID_PREFIX = uuid4().hex[:8]
+_MSG_COUNTER = count(1)
+
+
+def _next_message_id() -> str:
+    return f"{_MSG_ID_PREFIX}-{next(_MSG_COUNTER)}"
+
 
-class ChatMessage(BaseModel):
+# ChatMessage/ConversationState are internal-only (never validated from
+# untrusted input), so plain slotted dataclasses beat pydantic models on
+# the two-allocations-per-turn hot path.
+@dataclass(slots=True)
+class ChatMessage:
     """A single message in the conversation."""
-    id: str = Field(default_factory=lambda: str(uuid4()))
     role: str  # "user" or "assistant"
     content: str
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    id: str = field(default_factory=_next_message_id)
+    # Stored as a float; ISO formatting costs more than the rest of the
+    # construction and most messages are never serialized
+    ts: float = field(default_factory=time.time)
+
+    @property
+    def timestamp(self) -> str:
+        """ISO-8601 timestamp, formatted lazily on access."""
+        return datetime.fromtimestamp(self.ts, timezone.utc).isoformat()
+
+    def to_dict(self) -> dict[str, str]:
+        return {
+            "id": self.id,
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "ChatMessage":
+        raw_ts = data.get("timestamp")
+        ts = datetime.fromisoformat(raw_ts).timestamp() if raw_ts else time.time()
+        return cls(
+            role=data["role"],
+            content=data["content"],
+            id=data.get("id", "") or _next_message_id(),
+            ts=ts,
+        )
 
 
-class ConversationState(BaseModel):
+@dataclass(slots=True)
+class ConversationState:
     """Tracks the state of a conversation."""
-    id: str = Field(default_factory=lambda: str(uuid4()))
-    messages: list[ChatMessage] = Field(default_factory=list)
+    id: str = field(default_factory=lambda: str(uuid4()))
+    messages: list[ChatMessage] = field(default_factory=list)
     spec: TopologySpec | None = None
+    summary: str | None = None
+    # Lowered concatenation of all user messages, maintained incrementally
+    # so the fallback path doesn't re-join the whole history every turn
+    user_text_lower: str = ""
+    # Bedrock wire-format mirror of `messages`, appended to in lockstep so
+    # the converse payload isn't rebuilt dict-by-dict every turn
+    _bedrock_msgs: list[dict[str, Any]] = field(default_factory=list)
+    # Feature flags are monotonic (once mentioned, stays true), so each
+    # new user message is scanned once and OR-ed in rather than rescanning
+    # the whole history per turn
+    features: set[str] = field(default_factory=set)
     ready_to_generate: bool = False
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    # Serializes whole turns so concurrent messages for the same session
+    # can't interleave their history appends; never serialized
+    _turn_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "messages": [m.to_dict() for m in self.messages],
+            "spec": self.spec.model_dump() if self.spec else None,
+            "summary": self.summary,
+            "user_text_lower": self.user_text_lower,
+            "ready_to_generate": self.ready_to_generate,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ConversationState":
+        messages = [ChatMessage.from_dict(m) for m in data.get("messages", [])]
+        state = cls(
+            id=data["id"],
+            messages=messages,
+            spec=TopologySpec.model_validate(data["spec"]) if data.get("spec") else None,
+            summary=data.get("summary"),
+            user_text_lower=data.get("user_text_lower", ""),
+            ready_to_generate=data.get("ready_to_generate", False),
+            created_at=data.get("created_at", ""),
+        )
+        # The wire mirror and feature flags are derivable, so rebuild them
+        # instead of storing them
+        state._bedrock_msgs = [_wire_message(m.role, m.content) for m in messages]
+        state.features = _scan_features(state.user_text_lower)
+        return state
+
+
+MAX_CONVERSATIONS = int(os.environ.get("TOPNET_MAX_CONVERSATIONS", "10000"))
+
+
+class InMemoryStore:
+    """Bounded in-process LRU conversation store (single-worker default).
+
+    Accesses bump entries to the back and the oldest entry is evicted
+    once ``max_entries`` is reached, so a long-lived server does not
+    leak memory.
+    """
+
+    def __init__(self, max_entries: int = MAX_CONVERSATIONS):
+        self._conversations: OrderedDict[str, ConversationState] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get(self, conversation_id: str) -> ConversationState | None:
+        with self._lock:
+            conv = self._conversations.get(conversation_id)
+            if conv is not None:
+                self._conversations.move_to_end(conversation_id)
+            return conv
+
+    def put(self, conversation_id: str, state: ConversationState) -> None:
+        with self._lock:
+            self._conversations[conversation_id] = state
+            self._conversations.move_to_end(conversation_id)
+            while len(self._conversations) > self._max_entries:
+                # Drop the reference and let GC reclaim it: get() hands out
+                # live references, so a request mid-turn (or a history
+                # handler) may still be reading the evicted state and its
+                # messages must not be mutated or reused
+                self._conversations.popitem(last=False)
+
+    def delete(self, conversation_id: str) -> bool:
+        with self._lock:
+            return self._conversations.pop(conversation_id, None) is not None
+
+
+class SQLiteStore:
+    """SQLite-backed conversation store shared across uvicorn workers.
+
+    With the in-memory store a second worker cannot see the first
+    worker's sessions and every routed-elsewhere message silently resets
+    the chat; a shared database file fixes that without new
+    dependencies.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS conversations ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, conversation_id: str) -> ConversationState | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return ConversationState.from_dict(_json_loads(row[0]))
+
+    def put(self, conversation_id: str, state: ConversationState) -> None:
+        payload = _json_dumps(state.to_dict())
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversations (id, data, updated_at) VALUES (?, ?, ?)",
+                (conversation_id, payload, now),
+            )
+            self._conn.commit()
 
-# In-memory conversation store (in production, use a database)
-conversations: dict[str, ConversationState] = {}
+    def delete(self, conversation_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+
+def _make_store():
+    """Select the conversation store from TOPNET_CONV_STORE (memory|sqlite)."""
+    kind = os.environ.get("TOPNET_CONV_STORE", "memory").lower()
+    if kind == "sqlite":
+        return SQLiteStore(os.environ.get("TOPNET_CONV_DB", "topnet_conversations.db"))
+    return InMemoryStore()
+
+
+conversation_store = _make_store()
+
+# Process-wide Bedrock client; boto3 client construction parses service
+# models and opens a TLS session, so pay that cost once, not per message
+_bedrock_client = None
+_bedrock_lock = threading.Lock()
+
+
+def _get_bedrock():
+    """Lazily create and cache the Bedrock runtime client."""
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _bedrock_lock:
+            if _bedrock_client is None:
+                import boto3
+                from botocore.config import Config
+
+                _bedrock_client = boto3.client(
+                    service_name='bedrock-runtime',
+                    region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'),
+                    # Keep pooled connections alive between turns so each
+                    # message reuses the TCP+TLS session
+                    config=Config(
+                        retries={'max_attempts': 2, 'mode': 'standard'},
+                        tcp_keepalive=True,
+                        max_pool_connections=50,
+                    ),
+                )
+    return _bedrock_client
 
 
 SYSTEM_PROMPT = """You are TopNet, an AI assistant that helps users design cloud infrastructure on AWS. Your job is to have a CONVERSATION with the user to understand what they want to build, then generate a topology specification.
@@ -65,41 +304,6 @@ SYSTEM_PROMPT = """You are TopNet, an AI assistant that helps users design cloud
 2. User answers questions → Ask if they want you to generate, OR if they say "yes/sounds good/let's do it" then generate
 3. Generate topology with JSON spec
 
-✅ EXAMPLE OF GOOD CONVERSATION FLOW:
-
-**Turn 1:**
-User: "I need a web application with a database"
-You: "Got it! I'll help you set up a web application with a database.
-
-Quick questions to make sure I get this right:
-- What database engine do you prefer? (PostgreSQL or MySQL?)
-- How many web servers do you need? (I can start with 1 for simplicity)
-- Any specific AWS region? (I'll default to us-east-2 Ohio, which is cost-effective)
-
-Once you confirm, I'll generate the infrastructure design!"
-
-**Turn 2:**
-User: "PostgreSQL, 1 server is fine, use Ohio"
-You: "Perfect! Here's what I'll create for you:
-
-📦 Infrastructure Summary:
-• 1 EC2 web server (t3.micro) in Ohio
-• 1 RDS PostgreSQL database (db.t2.micro)
-• VPC with public subnet and security groups
-• ~$21/month estimated cost
-
-This is a TIER 1 setup - optimized for hobby/MVP projects (single AZ, no load balancer).
-
-[Generates JSON spec here]"
-
-❌ EXAMPLE OF BAD RESPONSE (DON'T DO THIS):
-User: "I need a web application with a database"
-You: "Here's what I'll create: [generates JSON immediately]"  ← WRONG! Ask questions first!
-
-❌ ANOTHER BAD EXAMPLE:
-User: "I need a highly available web application with load balancer"
-You: "Is this a web application, API, or something else?"  ← WRONG! They already said "web application"!
-
 🔧 WHEN TO GENERATE (ONLY after user answers your questions OR confirms):
 
 When the user has answered your questions and confirmed they want to proceed, include this VALID JSON block (no comments!) in your response:
@@ -141,75 +345,409 @@ When the user has answered your questions and confirmed they want to proceed, in
 4. Always explain what you're about to create before generating
 5. Mention the cost estimate and tier level (TIER 1 vs TIER 2)"""
 
+# Few-shot examples only help while the model is learning the expected
+# flow; after the first exchanges they are pure input-token cost, so
+# they live in their own block and are dropped on later turns
+SYSTEM_PROMPT_EXAMPLES = """✅ EXAMPLE OF GOOD CONVERSATION FLOW:
+
+**Turn 1:**
+User: "I need a web application with a database"
+You: "Got it! I'll help you set up a web application with a database.
+
+Quick questions to make sure I get this right:
+- What database engine do you prefer? (PostgreSQL or MySQL?)
+- How many web servers do you need? (I can start with 1 for simplicity)
+- Any specific AWS region? (I'll default to us-east-2 Ohio, which is cost-effective)
+
+Once you confirm, I'll generate the infrastructure design!"
+
+**Turn 2:**
+User: "PostgreSQL, 1 server is fine, use Ohio"
+You: "Perfect! Here's what I'll create for you:
+
+📦 Infrastructure Summary:
+• 1 EC2 web server (t3.micro) in Ohio
+• 1 RDS PostgreSQL database (db.t2.micro)
+• VPC with public subnet and security groups
+• ~$21/month estimated cost
+
+This is a TIER 1 setup - optimized for hobby/MVP projects (single AZ, no load balancer).
+
+[Generates JSON spec here]"
+
+❌ EXAMPLE OF BAD RESPONSE (DON'T DO THIS):
+User: "I need a web application with a database"
+You: "Here's what I'll create: [generates JSON immediately]"  ← WRONG! Ask questions first!
+
+❌ ANOTHER BAD EXAMPLE:
+User: "I need a highly available web application with load balancer"
+You: "Is this a web application, API, or something else?"  ← WRONG! They already said "web application"!"""
+
+
+def _compact_prompt(text: str) -> str:
+    """Drop blank lines and trailing whitespace; tokens cost on every call."""
+    return "\n".join(line.rstrip() for line in text.splitlines() if line.strip())
+
+
+# Precomputed system blocks: rules + examples for the opening turns, rules
+# only once the conversation is underway
+_SYSTEM_EARLY = [{"text": _compact_prompt(SYSTEM_PROMPT) + "\n" + _compact_prompt(SYSTEM_PROMPT_EXAMPLES)}]
+_SYSTEM_STEADY = [{"text": _compact_prompt(SYSTEM_PROMPT)}]
+
+
+def _system_blocks(conversation: "ConversationState") -> list[dict[str, str]]:
+    return _SYSTEM_EARLY if len(conversation.messages) <= 2 else _SYSTEM_STEADY
+
 
 def get_or_create_conversation(conversation_id: str | None = None) -> ConversationState:
     """Get existing conversation or create a new one."""
-    if conversation_id and conversation_id in conversations:
-        return conversations[conversation_id]
-    
+    if conversation_id:
+        conv = conversation_store.get(conversation_id)
+        if conv is not None:
+            return conv
+
     conv = ConversationState()
-    conversations[conv.id] = conv
+    conversation_store.put(conv.id, conv)
     return conv
 
 
-def chat_with_bedrock(conversation: ConversationState, user_message: str) -> str:
-    """Send message to AWS Bedrock and get response."""
-    import boto3
+# Precompiled patterns and keyword tables for the rule-based paths; these
+# run on every message, so avoid rebuilding them per call
+_WEB_KEYWORDS = ("web", "server", "ec2", "instance", "api", "backend", "app")
+_DB_KEYWORDS = ("database", "db", "rds", "postgres", "mysql", "sql")
+_HA_KEYWORDS = ("ha", "high availability", "redundant", "multiple", "2", "3", "two", "three")
+_CONFIRM_KEYWORDS = (
+    "yes", "confirm", "sounds good", "looks good", "let's do it",
+    "go ahead", "proceed", "generate", "create it",
+)
+# Exact-match variant for messages that are nothing but a confirmation
+_CONFIRM_EXACT = frozenset(_CONFIRM_KEYWORDS)
+
+# Role lookup by value; a dict miss is far cheaper than the ValueError
+# the enum constructor raises for unknown roles
+_ROLE_MAP = {role.value: role for role in ComponentRole}
+_GREETINGS = frozenset(["hi", "hello", "hey", "help", "start"])
+
+# Map each scanned keyword to the feature flags it sets; the whole user
+# history is scanned once instead of once per `any(kw in text ...)` check
+_FEATURE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    **{kw: ("web",) for kw in _WEB_KEYWORDS},
+    **{kw: ("db",) for kw in _DB_KEYWORDS},
+    **{kw: ("ha",) for kw in _HA_KEYWORDS},
+    "postgres": ("db", "postgres"),
+    "mysql": ("db", "mysql"),
+    "ohio": ("ohio", "region_mentioned"),
+    "virginia": ("region_mentioned",),
+    "west": ("west", "region_mentioned"),
+    "europe": ("europe", "region_mentioned"),
+    "eu": ("europe",),
+    "region": ("region_word", "region_mentioned"),
+}
+# Longest keywords first so e.g. "mysql" wins over "sql" at the same spot
+_FEATURE_RE = re.compile(
+    "|".join(map(re.escape, sorted(_FEATURE_KEYWORDS, key=len, reverse=True)))
+)
+
+
+def _scan_features(text: str) -> set[str]:
+    """Collect all feature flags from a lowered text in a single pass."""
+    flags: set[str] = set()
+    for match in _FEATURE_RE.finditer(text):
+        flags.update(_FEATURE_KEYWORDS[match.group(0)])
+    return flags
+_NUM_RE = re.compile(r"(\d+)\s*(?:server|instance|ec2)")
+_NUM_ANY_RE = re.compile(r"\d+\s*(?:server|instance)")
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+_LINE_COMMENT_RE = re.compile(r"//.*?$", re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+# Keep this many recent messages verbatim when talking to the LLM; older
+# turns are collapsed into a single summary message
+SUMMARY_WINDOW = 8
+
+
+def _summarize_history(messages: list[ChatMessage]) -> str:
+    """Build a cheap rule-based summary of older conversation turns.
+
+    Extracts the infrastructure facts the assistant actually needs
+    (tiers, engine, quantity, region) instead of paying to resend every
+    token of the prefix each turn.
+    """
+    all_user_text = " ".join(m.content.lower() for m in messages if m.role == "user")
+    facts = []
+    if any(kw in all_user_text for kw in _WEB_KEYWORDS):
+        facts.append("a web/app tier")
+    if any(kw in all_user_text for kw in _DB_KEYWORDS):
+        engine = "mysql" if "mysql" in all_user_text else "postgres"
+        facts.append(f"a {engine} database")
+    num_match = _NUM_RE.search(all_user_text)
+    if num_match:
+        facts.append(f"{num_match.group(1)} instance(s)")
+    for keyword, region in (("ohio", "us-east-2"), ("virginia", "us-east-1"),
+                            ("west", "us-west-2"), ("europe", "eu-west-1")):
+        if keyword in all_user_text:
+            facts.append(f"region {region}")
+            break
+    if not facts:
+        return "Earlier turns contained general discussion with no firm requirements yet."
+    return "Summary of earlier turns: the user wants " + ", ".join(facts) + "."
+
+
+def _wire_message(role: str, content: str) -> dict[str, Any]:
+    """Build one Bedrock converse message (content must be a block list)."""
+    return {"role": role, "content": [{"text": content}]}
+
+
+def _windowed_messages(conversation: ConversationState) -> list[dict[str, Any]]:
+    """Return the wire-format messages to forward to the LLM, summarizing old turns.
+
+    The per-message dicts come from the incrementally maintained
+    `_bedrock_msgs` mirror, so each turn only slices — it never rewraps
+    the whole history.
+    """
+    wire = conversation._bedrock_msgs
+    if len(wire) <= SUMMARY_WINDOW:
+        return list(wire)
+    # Converse requires the first message to be from the user and roles to
+    # alternate, so trim the tail to a user-first boundary (at call time the
+    # mirror ends with the just-appended user message, making a fixed even
+    # slice start on an assistant turn).
+    tail = wire[-SUMMARY_WINDOW:]
+    while tail and tail[0]["role"] != "user":
+        tail = tail[1:]
+    # The extractor is cheap, so refresh the summary as the window slides
+    conversation.summary = _summarize_history(
+        conversation.messages[:len(wire) - len(tail)]
+    )
+    # Fold the summary into the first windowed user message; a separate
+    # summary message of either role would break alternation
+    merged = _wire_message(
+        "user", f"{conversation.summary}\n\n{tail[0]['content'][0]['text']}"
+    )
+    return [merged, *tail[1:]]
+
+
+# Models to try, first entry preferred. With several configured, calls
+# race in parallel and the first successful reply wins instead of paying
+# a rate-limited model's full latency before the next one starts.
+_MODEL_IDS = tuple(
+    m.strip()
+    for m in os.environ.get("TOPNET_BEDROCK_MODELS", "amazon.nova-micro-v1:0").split(",")
+    if m.strip()
+)
+_race_executor: ThreadPoolExecutor | None = None
+
+
+def _converse(model_id: str, messages: list[dict[str, Any]], system: list[dict[str, str]]) -> str:
+    response = _get_bedrock().converse(
+        modelId=model_id,
+        messages=messages,
+        system=system,
+        inferenceConfig={
+            "maxTokens": 1000,
+            "temperature": 0.7,
+        }
+    )
+    return response['output']['message']['content'][0]['text']
+
+
+def chat_with_bedrock(conversation: ConversationState, user_message: str) -> str | None:
+    """Send message to AWS Bedrock; returns None when every model fails.
+
+    Failures are signalled rather than swallowed into a fallback reply so
+    the caller can distinguish a genuine model response (cacheable) from a
+    degraded one (must not be cached).
+    """
+    global _race_executor
+    try:
+        # The just-received user message is already in the mirror
+        messages = _windowed_messages(conversation)
+        system = _system_blocks(conversation)
+
+        if len(_MODEL_IDS) == 1:
+            return _converse(_MODEL_IDS[0], messages, system)
+
+        # Shared executor, not a with-block: shutdown would join the
+        # losing calls and forfeit the head start
+        if _race_executor is None:
+            _race_executor = ThreadPoolExecutor(
+                max_workers=len(_MODEL_IDS) * 4, thread_name_prefix="bedrock-race"
+            )
+        futures = [
+            _race_executor.submit(_converse, model_id, messages, system)
+            for model_id in _MODEL_IDS
+        ]
+        error: Exception | None = None
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except Exception as e:  # noqa: PERF203 - losers may also fail
+                error = e
+        raise error if error else RuntimeError("no Bedrock models configured")
+    except Exception as e:
+        # Traceback formatting is deliberately skipped: failures here
+        # include routine throttling, and the fallback is the recovery
+        print(f"[chat] Bedrock models {_MODEL_IDS} failed: {e}")
+        return None
+
+
+def chat_with_bedrock_stream(conversation: ConversationState, user_message: str):
+    """Stream the Bedrock response as text chunks.
 
+    Yields delta text as the model produces it so the HTTP layer can
+    deliver early tokens instead of blocking on the full completion.
+    Falls back to the rule-based response (as a single chunk) on error.
+    """
     try:
-        # Create Bedrock runtime client
-        bedrock = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+        bedrock = _get_bedrock()
+
+        # The just-received user message is already in the mirror
+        messages = _windowed_messages(conversation)
+
+        model_id = _MODEL_IDS[0]
+        response = bedrock.converse_stream(
+            modelId=model_id,
+            messages=messages,
+            system=_system_blocks(conversation),
+            inferenceConfig={
+                "maxTokens": 1000,
+                "temperature": 0.7,
+            }
         )
+        for event in response['stream']:
+            delta = event.get('contentBlockDelta', {}).get('delta', {})
+            text = delta.get('text')
+            if text:
+                yield text
 
-        # Build messages - content must be list of objects
-        messages = []
-        for msg in conversation.messages:
-            messages.append({
-                "role": msg.role, 
-                "content": [{"text": msg.content}]
-            })
-        messages.append({
-            "role": "user", 
-            "content": [{"text": user_message}]
-        })
+    except Exception as e:
+        print(f"[chat] Bedrock streaming failed: {e}")
+        yield generate_fallback_response(conversation, user_message)
 
-        # Use Amazon Nova
-        model_id = "amazon.nova-micro-v1:0"
 
+def process_chat_message_stream(conversation_id: str | None, user_message: str):
+    """Streaming variant of process_chat_message.
+
+    Yields response chunks; the accumulated text is stored on the
+    conversation (with spec extraction) once the stream is exhausted.
+    """
+    conversation = get_or_create_conversation(conversation_id)
+    # Same turn lock as process_chat_message: a concurrent /message and
+    # /message/stream for one session must not interleave their appends
+    with conversation._turn_lock:
+        conversation.messages.append(ChatMessage(role="user", content=user_message))
+        conversation._bedrock_msgs.append(_wire_message("user", user_message))
+        msg_lower = user_message.lower()
+        conversation.user_text_lower = (
+            conversation.user_text_lower + " " + msg_lower
+            if conversation.user_text_lower
+            else msg_lower
+        )
+        conversation.features |= _scan_features(msg_lower)
+
+        chunks: list[str] = []
+        # A client disconnect raises GeneratorExit at a yield; the finally
+        # block still records the turn so the wire mirror keeps alternating
+        # instead of stranding a trailing user message
         try:
-            print(f"[chat] Calling model: {model_id}")
-            response = bedrock.converse(
-                modelId=model_id,
-                messages=messages,
-                system=[{"text": SYSTEM_PROMPT}],
-                inferenceConfig={
-                    "maxTokens": 1000,
-                    "temperature": 0.7,
-                }
-            )
-            print(f"[chat] Success with model: {model_id}")
-            return response['output']['message']['content'][0]['text']
-        except Exception as e:
-            print(f"[chat] Model {model_id} failed: {e}")
-            raise
+            if os.environ.get('AWS_ACCESS_KEY_ID') or os.environ.get('AWS_PROFILE'):
+                for chunk in chat_with_bedrock_stream(conversation, user_message):
+                    chunks.append(chunk)
+                    yield chunk
+            else:
+                response = generate_fallback_response(conversation, user_message)
+                chunks.append(response)
+                yield response
+        finally:
+            ai_response = "".join(chunks)
+            if ai_response:
+                conversation.messages.append(
+                    ChatMessage(role="assistant", content=ai_response)
+                )
+                conversation._bedrock_msgs.append(
+                    _wire_message("assistant", ai_response)
+                )
+                spec = extract_spec_from_response(ai_response)
+                if spec:
+                    conversation.spec = spec
+                    conversation.ready_to_generate = True
+            else:
+                # Aborted before any text arrived: drop the orphaned user
+                # message rather than leave two consecutive user turns
+                conversation.messages.pop()
+                conversation._bedrock_msgs.pop()
+            conversation_store.put(conversation.id, conversation)
+
+
+# Content-addressed response cache: duplicate prompts with the same
+# recent context short-circuit the whole Bedrock round-trip. Keyed on the
+# system prompt digest plus the last few turns, so any prompt edit or
+# differing context misses naturally.
+_LLM_CACHE_SIZE = 1024
+_LLM_CACHE_TTL = 300.0
+_LLM_CACHE_TAIL = 6
+_llm_cache: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+_llm_cache_lock = threading.Lock()
+_PROMPT_DIGEST = hashlib.blake2b(
+    _SYSTEM_EARLY[0]["text"].encode(), digest_size=8
+).hexdigest()
+
+
+def _llm_cache_key(conversation: ConversationState, user_message: str) -> bytes:
+    tail = [(m.role, m.content) for m in conversation.messages[-_LLM_CACHE_TAIL:]]
+    payload = _json_dumps([_PROMPT_DIGEST, tail, user_message])
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def _llm_cache_get(key: bytes) -> str | None:
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is None:
+            return None
+        expires, response = entry
+        if expires < time.monotonic():
+            del _llm_cache[key]
+            return None
+        _llm_cache.move_to_end(key)
+        return response
 
-    except Exception as e:
-        import traceback
-        print(f"[chat] Bedrock chat failed: {e}")
-        print(f"[chat] Traceback: {traceback.format_exc()}")
-        # Fall back to rule-based response
-        return generate_fallback_response(conversation, user_message)
+
+def _llm_cache_put(key: bytes, response: str) -> None:
+    with _llm_cache_lock:
+        _llm_cache[key] = (time.monotonic() + _LLM_CACHE_TTL, response)
+        _llm_cache.move_to_end(key)
+        while len(_llm_cache) > _LLM_CACHE_SIZE:
+            _llm_cache.popitem(last=False)
 
 
 def chat_with_llm(conversation: ConversationState, user_message: str) -> str:
     """Send message to LLM and get response. Tries AWS Bedrock, then rule-based fallback."""
 
+    # Pure confirmations ("yes", "go ahead") don't need an LLM round-trip:
+    # once the conversation already carries web/db signals, the rule-based
+    # path emits the JSON spec deterministically
+    msg_lower = user_message.lower().strip()
+    if msg_lower in _CONFIRM_EXACT:
+        features = conversation.features
+        if "web" in features or "db" in features:
+            print("[chat] Confirmation short-circuit, skipping LLM")
+            return generate_fallback_response(conversation, user_message)
+
     # Try AWS Bedrock first (uses AWS credentials from env)
     if os.environ.get('AWS_ACCESS_KEY_ID') or os.environ.get('AWS_PROFILE'):
         print("[chat] Using AWS Bedrock Nova")
-        return chat_with_bedrock(conversation, user_message)
+        key = _llm_cache_key(conversation, user_message)
+        cached = _llm_cache_get(key)
+        if cached is not None:
+            return cached
+        response = chat_with_bedrock(conversation, user_message)
+        if response is None:
+            # Never cache the degraded reply: an identical prompt should
+            # retry Bedrock as soon as it recovers, not be pinned to the
+            # rule-based answer for the TTL
+            return generate_fallback_response(conversation, user_message)
+        _llm_cache_put(key, response)
+        return response
 
     # Fall back to rule-based response
     print("[chat] Using rule-based fallback")
@@ -222,8 +760,7 @@ def generate_fallback_response(conversation: ConversationState, user_message: st
     msg_count = len(conversation.messages)
 
     # Greetings
-    greetings = ["hi", "hello", "hey", "help", "start"]
-    if msg_lower in greetings or msg_count == 0:
+    if msg_lower in _GREETINGS or msg_count == 0:
         return """Hi! I'm TopNet, your cloud infrastructure assistant. 👋
 
 I'll help you design your AWS infrastructure. Let me ask a few questions:
@@ -237,57 +774,60 @@ Just describe what you need, and I'll help you configure it!"""
 
     # Check for infrastructure keywords in ENTIRE conversation (not just current message)
     # This ensures we remember what user mentioned earlier
-    all_user_messages = " ".join([msg.content.lower() for msg in conversation.messages if msg.role == "user"])
-    has_web = any(kw in all_user_messages for kw in ["web", "server", "ec2", "instance", "api", "backend", "app"])
-    has_db = any(kw in all_user_messages for kw in ["database", "db", "rds", "postgres", "mysql", "sql"])
-    has_ha = any(kw in all_user_messages for kw in ["ha", "high availability", "redundant", "multiple", "2", "3", "two", "three"])
+    all_user_messages = conversation.user_text_lower
+    features = conversation.features
+    has_web = "web" in features
+    has_db = "db" in features
+    has_ha = "ha" in features
 
     # Check for confirmation keywords
-    has_confirmation = any(kw in msg_lower for kw in ["yes", "confirm", "sounds good", "looks good", "let's do it", "go ahead", "proceed", "generate", "create it"])
+    has_confirmation = any(kw in msg_lower for kw in _CONFIRM_KEYWORDS)
 
     # On first turn, always ask questions (unless they're confirming)
     if msg_count <= 2 and not has_confirmation:
-        # Ask clarifying questions
-        response_parts = ["Got it! I'll help you set up "]
+        # Ask clarifying questions; a single StringIO buffer avoids the
+        # intermediate parts list + final join pass
+        buf = io.StringIO()
+        buf.write("Got it! I'll help you set up ")
 
         if has_web and has_db:
-            response_parts.append("a web application with a database.\n\n")
+            buf.write("a web application with a database.\n\n")
         elif has_web:
-            response_parts.append("a web server.\n\n")
+            buf.write("a web server.\n\n")
         elif has_db:
-            response_parts.append("a database.\n\n")
+            buf.write("a database.\n\n")
         else:
-            response_parts.append("your infrastructure.\n\n")
+            buf.write("your infrastructure.\n\n")
 
-        response_parts.append("Quick questions to make sure I get this right:\n\n")
+        buf.write("Quick questions to make sure I get this right:\n\n")
 
         questions = []
 
         # Ask about database if mentioned but not specific (check entire conversation)
-        if has_db and not ("postgres" in all_user_messages or "mysql" in all_user_messages):
+        if has_db and not ("postgres" in features or "mysql" in features):
             questions.append("- What database engine? (PostgreSQL or MySQL?)")
 
         # Ask about quantity if not specified (check entire conversation)
-        if has_web and not has_ha and not re.search(r'\d+\s*(?:server|instance)', all_user_messages):
+        if has_web and not has_ha and not _NUM_ANY_RE.search(all_user_messages):
             questions.append("- How many web servers? (I can start with 1 for simplicity)")
 
         # Ask about region if not mentioned (check entire conversation)
-        if not any(r in all_user_messages for r in ["region", "ohio", "virginia", "west", "europe"]):
+        if "region_mentioned" not in features:
             questions.append("- Any AWS region preference? (I'll default to us-east-2 Ohio)")
 
         # Always ask at least one question
         if not questions:
             questions.append("- Should I proceed with the defaults? (t3.micro instances, us-east-2 region)")
 
-        response_parts.append("\n".join(questions))
-        response_parts.append("\n\nOnce you confirm, I'll generate the infrastructure design!")
+        buf.write("\n".join(questions))
+        buf.write("\n\nOnce you confirm, I'll generate the infrastructure design!")
 
-        return "".join(response_parts)
+        return buf.getvalue()
 
     # If user is confirming or answering questions, proceed with generation
     # Extract numbers (check entire conversation)
     quantity = 1
-    num_match = re.search(r'(\d+)\s*(?:server|instance|ec2)', all_user_messages)
+    num_match = _NUM_RE.search(all_user_messages)
     if num_match:
         quantity = int(num_match.group(1))
     elif has_ha:
@@ -295,11 +835,11 @@ Just describe what you need, and I'll help you configure it!"""
 
     # Detect region (check entire conversation)
     region = "us-east-2"
-    if "ohio" in all_user_messages:
+    if "ohio" in features:
         region = "us-east-2"
-    elif "west" in all_user_messages:
+    elif "west" in features:
         region = "us-west-2"
-    elif "europe" in all_user_messages or "eu" in all_user_messages:
+    elif "europe" in features:
         region = "eu-west-1"
 
     # Detect instance type (check current message only - user likely specifying size in follow-up)
@@ -310,11 +850,7 @@ Just describe what you need, and I'll help you configure it!"""
         instance_type = "t3.medium"
 
     # Detect DB engine (check entire conversation - user mentioned this earlier)
-    db_engine = "postgres"
-    if "mysql" in all_user_messages:
-        db_engine = "mysql"
-    elif "postgres" in all_user_messages:
-        db_engine = "postgres"
+    db_engine = "mysql" if "mysql" in features else "postgres"
 
     # If we have enough info, generate the spec
     if has_web or has_db:
@@ -336,17 +872,20 @@ Just describe what you need, and I'll help you configure it!"""
                 "constraints": {"engine": db_engine, "instance_class": "db.t3.micro"}
             })
 
-        spec_json = json.dumps({
+        spec_json = _json_dumps_indented({
             "ready": True,
             "spec": {
                 "provider": "aws",
                 "region": region,
                 "components": components
             }
-        }, indent=2)
+        })
 
         # Build response - acknowledge what they said
-        response_parts = ["Perfect! I understand you need:\n"]
+        # Single buffer, newline-prefixed writes: same output as the old
+        # parts list + "\n".join without the second pass
+        buf = io.StringIO()
+        buf.write("Perfect! I understand you need:\n")
 
         # List what we understood from their message
         understood = []
@@ -363,45 +902,45 @@ Just describe what you need, and I'll help you configure it!"""
             understood.append(f"✓ {db_engine.upper()} database")
 
         if understood:
-            response_parts.append("\n".join(understood))
-            response_parts.append("\n\nHere's what I'll create:\n")
-        
+            buf.write("\n" + "\n".join(understood))
+            buf.write("\n\n\nHere's what I'll create:\n")
+
         if has_web and not has_db and quantity == 1:
             # Simple mode - explain the minimal infrastructure
-            response_parts.append(f"**Simple Setup** (minimal AWS infrastructure):")
-            response_parts.append(f"- 1 EC2 instance ({instance_type}) for your server")
-            response_parts.append(f"- VPC (virtual network)")
-            response_parts.append(f"- Subnet (network segment)")
-            response_parts.append(f"- Security group (firewall rules)")
-            response_parts.append(f"- Internet gateway + route table")
-            response_parts.append(f"\n_Total: ~6 resources. This is the minimum AWS needs to run a server._")
+            buf.write("\n**Simple Setup** (minimal AWS infrastructure):")
+            buf.write(f"\n- 1 EC2 instance ({instance_type}) for your server")
+            buf.write("\n- VPC (virtual network)")
+            buf.write("\n- Subnet (network segment)")
+            buf.write("\n- Security group (firewall rules)")
+            buf.write("\n- Internet gateway + route table")
+            buf.write("\n\n_Total: ~6 resources. This is the minimum AWS needs to run a server._")
         else:
             # Production mode - list main components
             if has_web:
-                response_parts.append(f"- **{quantity} EC2 instance(s)** ({instance_type}) for your web/app tier")
+                buf.write(f"\n- **{quantity} EC2 instance(s)** ({instance_type}) for your web/app tier")
             if has_db:
-                response_parts.append(f"- **RDS {db_engine.upper()}** database")
-            response_parts.append(f"- **Networking**: VPC, subnets across 2 AZs, load balancer, NAT gateway, security groups, route tables")
+                buf.write(f"\n- **RDS {db_engine.upper()}** database")
+            buf.write("\n- **Networking**: VPC, subnets across 2 AZs, load balancer, NAT gateway, security groups, route tables")
 
-        response_parts.append(f"\n**Region:** {region}")
+        buf.write(f"\n\n**Region:** {region}")
 
         # Only ask clarifying questions if we're missing key info (check entire conversation)
         clarifying_questions = []
         if not has_db:
             clarifying_questions.append("- Do you need a database? (PostgreSQL/MySQL, or no database)")
-        if "region" not in all_user_messages and "ohio" not in all_user_messages and region == "us-east-2":
+        if "region_word" not in features and "ohio" not in features and region == "us-east-2":
             clarifying_questions.append(f"- Region preference? (I'll use {region} by default)")
 
         if clarifying_questions:
-            response_parts.append("\n\n**Quick question:**")
-            response_parts.extend(clarifying_questions)
-            response_parts.append("\nOr if this looks good, click **Generate Topology** below!")
+            buf.write("\n\n\n**Quick question:**")
+            buf.write("\n" + "\n".join(clarifying_questions))
+            buf.write("\n\nOr if this looks good, click **Generate Topology** below!")
         else:
-            response_parts.append("\nDoes this look good? Click **Generate Topology** below!")
+            buf.write("\n\nDoes this look good? Click **Generate Topology** below!")
 
-        response_parts.append(f"\n```json\n{spec_json}\n```")
+        buf.write(f"\n\n```json\n{spec_json}\n```")
 
-        return "\n".join(response_parts)
+        return buf.getvalue()
     
     # Need more info - ask follow-up questions
     if msg_count < 2:
@@ -439,42 +978,84 @@ def process_chat_message(
     
     # Get or create conversation
     conversation = get_or_create_conversation(conversation_id)
-    
-    # Add user message
-    conversation.messages.append(ChatMessage(role="user", content=user_message))
-    
-    # Get AI response
-    ai_response = chat_with_llm(conversation, user_message)
-    
-    # Add AI response
-    conversation.messages.append(ChatMessage(role="assistant", content=ai_response))
-    
-    # Check if response contains a spec
-    spec = extract_spec_from_response(ai_response)
-    if spec:
-        conversation.spec = spec
-        conversation.ready_to_generate = True
-    
-    # Save conversation
-    conversations[conversation.id] = conversation
-    
+
+    # One turn at a time per conversation: concurrent calls for the same
+    # session would otherwise interleave their history appends
+    with conversation._turn_lock:
+        # Add user message
+        conversation.messages.append(ChatMessage(role="user", content=user_message))
+        conversation._bedrock_msgs.append(_wire_message("user", user_message))
+        msg_lower = user_message.lower()
+        conversation.user_text_lower = (
+            conversation.user_text_lower + " " + msg_lower
+            if conversation.user_text_lower
+            else msg_lower
+        )
+        conversation.features |= _scan_features(msg_lower)
+
+        # Get AI response
+        ai_response = chat_with_llm(conversation, user_message)
+
+        # Add AI response
+        conversation.messages.append(ChatMessage(role="assistant", content=ai_response))
+        conversation._bedrock_msgs.append(_wire_message("assistant", ai_response))
+
+        # Check if response contains a spec
+        spec = extract_spec_from_response(ai_response)
+        if spec:
+            conversation.spec = spec
+            conversation.ready_to_generate = True
+
+        # Both message appends flush in this one put: in memory it just
+        # refreshes the LRU position, persistent stores serialize once
+        conversation_store.put(conversation.id, conversation)
+
     return conversation, ai_response, spec
 
 
+# Bound on concurrently in-flight LLM turns; to_thread shares the default
+# executor, so this keeps a burst of sessions from exhausting it
+_LLM_CONCURRENCY = int(os.environ.get("TOPNET_LLM_CONCURRENCY", "64"))
+_llm_semaphore: asyncio.Semaphore | None = None
+
+
+async def process_chat_message_async(
+    conversation_id: str | None,
+    user_message: str,
+) -> tuple[ConversationState, str, TopologySpec | None]:
+    """Async wrapper so the blocking Bedrock call leaves the event loop free.
+
+    boto3 has no async client, so the whole turn runs in a worker thread;
+    other sessions' requests proceed concurrently instead of queuing
+    behind a multi-second converse call.
+    """
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(_LLM_CONCURRENCY)
+    async with _llm_semaphore:
+        return await asyncio.to_thread(process_chat_message, conversation_id, user_message)
+
+
 def extract_spec_from_response(response: str) -> TopologySpec | None:
     """Extract TopologySpec from AI response if present."""
+    # Cheap pre-filter: most conversational replies contain no code fence
+    if "```" not in response:
+        return None
+
     # Look for JSON block
-    json_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", response)
+    json_match = _JSON_BLOCK_RE.search(response)
     if not json_match:
         return None
-    
+
     try:
         json_str = json_match.group(1)
         # Remove JavaScript-style comments that LLMs sometimes add
-        json_str = re.sub(r'//.*?$', '', json_str, flags=re.MULTILINE)
-        json_str = re.sub(r'/\*.*?\*/', '', json_str, flags=re.DOTALL)
+        if "//" in json_str:
+            json_str = _LINE_COMMENT_RE.sub('', json_str)
+        if "/*" in json_str:
+            json_str = _BLOCK_COMMENT_RE.sub('', json_str)
         
-        data = json.loads(json_str)
+        data = _json_loads(json_str)
         
         if not data.get("ready"):
             return None
@@ -483,35 +1064,30 @@ def extract_spec_from_response(response: str) -> TopologySpec | None:
         components = []
         
         for comp in spec_data.get("components", []):
-            role_str = comp.get("role", "other")
-            try:
-                role = ComponentRole(role_str)
-            except ValueError:
-                role = ComponentRole.OTHER
-            
+            role = _ROLE_MAP.get(comp.get("role", "other"), ComponentRole.OTHER)
+
+            # Shape is already enforced by the .get() defaults above, so
+            # skip pydantic validation like the builder does internally
             components.append(
-                ComponentSpec(
+                ComponentSpec.model_construct(
                     role=role,
                     quantity=comp.get("quantity"),
                     description=comp.get("description", ""),
                     constraints=comp.get("constraints"),
                 )
             )
-        
-        return TopologySpec(
+
+        return TopologySpec.model_construct(
             provider=spec_data.get("provider", "aws"),
             region=spec_data.get("region", "us-east-2"),
             components=components,
         )
     
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+    except (ValueError, KeyError, TypeError) as e:
         print(f"Failed to extract spec: {e}")
         return None
 
 
 def clear_conversation(conversation_id: str) -> bool:
-    """Clear a conversation from memory."""
-    if conversation_id in conversations:
-        del conversations[conversation_id]
-        return True
-    return False
+    """Clear a conversation from the store."""
+    return conversation_store.delete(conversation_id)
@@ -1,13 +1,56 @@
 # app/core/nlp.py
 """Natural Language to TopologySpec parser using LLM."""
 
+import atexit
 import json
 import os
 import re
+import threading
+from functools import lru_cache
 from typing import Any
 
 from app.core.spec import ComponentRole, ComponentSpec, TopologySpec
 
+# Prefer orjson's C parser for LLM replies, like chat.py does; stdlib
+# json remains the fallback when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(s: str) -> Any:
+        return orjson.loads(s)
+except ImportError:  # pragma: no cover - exercised only without orjson
+    def _json_loads(s: str) -> Any:
+        return json.loads(s)
+
+# Persistent HTTP client for OpenAI calls; a fresh httpx.post() performs
+# a new TCP+TLS handshake per request, which dominates per-turn latency
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def _get_openai_client():
+    """Lazily create and cache a keep-alive httpx client."""
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                import httpx
+
+                limits = httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=100,
+                    keepalive_expiry=300.0,
+                )
+                try:
+                    client = httpx.Client(http2=True, timeout=30.0, limits=limits)
+                except ImportError:
+                    # h2 extra not installed; HTTP/1.1 keep-alive still
+                    # saves the handshake per call
+                    client = httpx.Client(timeout=30.0, limits=limits)
+                atexit.register(client.close)
+                _openai_client = client
+    return _openai_client
+
 
 # System prompt for the LLM
 SYSTEM_PROMPT = """You are a cloud infrastructure expert. Given a natural language description of cloud infrastructure, extract the components and return a JSON specification.
@@ -49,17 +92,19 @@ Infer reasonable defaults:
 Output ONLY the JSON, no explanation."""
 
 
+# Markdown code-fence extractor for LLM replies, compiled once at import
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
+
 def parse_nl_to_spec_with_llm(prompt: str, api_key: str | None = None) -> TopologySpec:
     """Parse natural language prompt to TopologySpec using OpenAI API."""
-    import httpx
-
     api_key = api_key or os.environ.get("OPENAI_API_KEY")
     if not api_key:
         # Fall back to rule-based parsing
         return parse_nl_to_spec_rules(prompt)
 
     try:
-        response = httpx.post(
+        response = _get_openai_client().post(
             "https://api.openai.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -74,18 +119,17 @@ def parse_nl_to_spec_with_llm(prompt: str, api_key: str | None = None) -> Topolo
                 "temperature": 0.1,
                 "max_tokens": 1000,
             },
-            timeout=30.0,
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
         content = data["choices"][0]["message"]["content"]
 
         # Extract JSON from response (handle markdown code blocks)
-        json_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", content)
+        json_match = _JSON_BLOCK_RE.search(content)
         if json_match:
             content = json_match.group(1)
 
-        spec_dict = json.loads(content)
+        spec_dict = _json_loads(content)
         return _dict_to_spec(spec_dict)
 
     except Exception as e:
@@ -93,14 +137,70 @@ def parse_nl_to_spec_with_llm(prompt: str, api_key: str | None = None) -> Topolo
         return parse_nl_to_spec_rules(prompt)
 
 
+# Keyword tables and compiled alternations for the rule-based parser;
+# each was previously an inline list rescanned with any() per call. The
+# alternations keep plain substring semantics (no word boundaries).
+_GREETINGS = frozenset(["hi", "hello", "hey", "help", "test", "yo", "sup"])
+
+_REGION_PATTERNS = {
+    "us-east-1": ["us-east-1", "n. virginia", "virginia", "east"],
+    "us-east-2": ["us-east-2", "ohio"],
+    "us-west-1": ["us-west-1", "n. california", "california"],
+    "us-west-2": ["us-west-2", "oregon", "west"],
+    "eu-west-1": ["eu-west-1", "ireland", "europe"],
+    "eu-central-1": ["eu-central-1", "frankfurt", "germany"],
+    "ap-northeast-1": ["ap-northeast-1", "tokyo", "japan"],
+    "ap-southeast-1": ["ap-southeast-1", "singapore"],
+}
+_REGION_RES = {
+    region: re.compile("|".join(map(re.escape, patterns)))
+    for region, patterns in _REGION_PATTERNS.items()
+}
+
+# One keyword -> flags table scanned in a single pass, like chat.py's
+# feature scan: the automaton walks the prompt once instead of once per
+# category. Longest keywords sort first so e.g. "web server" wins over
+# "server" at the same position. Engine and size keywords ride along in
+# the same pass rather than re-scanning the prompt per branch.
+_FLAG_KEYWORDS: dict[str, tuple[str, ...]] = {}
+for _kw in ("vpc", "subnet", "network", "cidr", "private subnet", "public subnet"):
+    _FLAG_KEYWORDS[_kw] = ("networking",)
+for _kw in ("web server", "web tier", "application server", "app server",
+            "ec2", "instance", "server", "backend", "api server", "nginx",
+            "apache", "compute", "vm", "virtual machine", "host"):
+    _FLAG_KEYWORDS[_kw] = ("web",)
+for _kw in ("ha", "high availability", "redundant", "fault tolerant", "multi-az", "across az"):
+    _FLAG_KEYWORDS[_kw] = ("ha",)
+for _kw in ("database", "rds", "postgres", "postgresql", "sql", "data store", "datastore"):
+    _FLAG_KEYWORDS[_kw] = ("db",)
+_FLAG_KEYWORDS["db"] = ("db",)
+_FLAG_KEYWORDS["mysql"] = ("db", "mysql")
+_FLAG_KEYWORDS["mariadb"] = ("db", "mysql")
+_FLAG_KEYWORDS["aurora"] = ("db", "aurora")
+for _kw in ("create", "build", "deploy", "setup", "provision", "launch", "make", "need", "want"):
+    _FLAG_KEYWORDS[_kw] = ("infra",)
+for _kw in ("large", "medium", "small"):
+    _FLAG_KEYWORDS[_kw] = (f"size_{_kw}",)
+_FLAG_RE = re.compile("|".join(
+    re.escape(kw) for kw in sorted(_FLAG_KEYWORDS, key=len, reverse=True)
+))
+
+
+def _scan_flags(text: str) -> set[str]:
+    """Collect all category flags present in ``text`` in one pass."""
+    flags: set[str] = set()
+    for m in _FLAG_RE.finditer(text):
+        flags.update(_FLAG_KEYWORDS[m.group(0)])
+    return flags
+
+
 def parse_nl_to_spec_rules(prompt: str) -> TopologySpec:
     """Parse natural language prompt to TopologySpec using rule-based approach."""
     prompt_lower = prompt.lower().strip()
     components: list[ComponentSpec] = []
 
     # Check if prompt is too short or just a greeting
-    greetings = ["hi", "hello", "hey", "help", "test", "yo", "sup"]
-    if len(prompt_lower) < 10 or prompt_lower in greetings:
+    if len(prompt_lower) < 10 or prompt_lower in _GREETINGS:
         # Return empty components - the API will handle this with a helpful message
         return TopologySpec(
             provider="aws",
@@ -110,47 +210,36 @@ def parse_nl_to_spec_rules(prompt: str) -> TopologySpec:
 
     # Detect region
     region = "us-east-1"
-    region_patterns = {
-        "us-east-1": ["us-east-1", "n. virginia", "virginia", "east"],
-        "us-east-2": ["us-east-2", "ohio"],
-        "us-west-1": ["us-west-1", "n. california", "california"],
-        "us-west-2": ["us-west-2", "oregon", "west"],
-        "eu-west-1": ["eu-west-1", "ireland", "europe"],
-        "eu-central-1": ["eu-central-1", "frankfurt", "germany"],
-        "ap-northeast-1": ["ap-northeast-1", "tokyo", "japan"],
-        "ap-southeast-1": ["ap-southeast-1", "singapore"],
-    }
-    for reg, patterns in region_patterns.items():
-        if any(p in prompt_lower for p in patterns):
+    for reg, pattern in _REGION_RES.items():
+        if pattern.search(prompt_lower):
             region = reg
             break
 
+    # One pass over the prompt yields every category flag
+    flags = _scan_flags(prompt_lower)
+
     # Detect networking-only request (VPC, subnets without compute)
-    networking_keywords = ["vpc", "subnet", "network", "cidr", "private subnet", "public subnet"]
-    has_networking = any(kw in prompt_lower for kw in networking_keywords)
-    
+    has_networking = "networking" in flags
+
     # Detect web tier
-    web_keywords = ["web server", "web tier", "application server", "app server", 
-                    "ec2", "instance", "server", "backend", "api server", "nginx", 
-                    "apache", "compute", "vm", "virtual machine", "host"]
-    has_web = any(kw in prompt_lower for kw in web_keywords)
-    
+    has_web = "web" in flags
+
     if has_web:
-        quantity = _extract_quantity(prompt_lower, ["server", "instance", "ec2", "host", "vm"])
-        
+        quantity = _extract_quantity(prompt_lower, ("server", "instance", "ec2", "host", "vm"))
+
         # Check for HA requirements
-        if any(kw in prompt_lower for kw in ["ha", "high availability", "redundant", "fault tolerant", "multi-az", "across az"]):
+        if "ha" in flags:
             quantity = max(quantity, 2)
         
         # Check instance type
         instance_type = "t3.micro"
-        if "large" in prompt_lower:
+        if "size_large" in flags:
             instance_type = "t3.large"
-        elif "medium" in prompt_lower:
+        elif "size_medium" in flags:
             instance_type = "t3.medium"
-        elif "small" in prompt_lower:
+        elif "size_small" in flags:
             instance_type = "t3.small"
-        
+
         components.append(
             ComponentSpec(
                 role=ComponentRole.WEB_TIER,
@@ -161,25 +250,23 @@ def parse_nl_to_spec_rules(prompt: str) -> TopologySpec:
         )
 
     # Detect database tier
-    db_keywords = ["database", "db", "rds", "postgres", "postgresql", "mysql", 
-                   "mariadb", "sql", "aurora", "data store", "datastore"]
-    has_db = any(kw in prompt_lower for kw in db_keywords)
-    
+    has_db = "db" in flags
+
     if has_db:
         # Detect engine
         engine = "postgres"  # default
-        if "mysql" in prompt_lower or "mariadb" in prompt_lower:
+        if "mysql" in flags:
             engine = "mysql"
-        elif "aurora" in prompt_lower:
+        elif "aurora" in flags:
             engine = "aurora-postgresql"
-        
+
         # Detect instance class
         instance_class = "db.t3.micro"
-        if "large" in prompt_lower:
+        if "size_large" in flags:
             instance_class = "db.t3.large"
-        elif "medium" in prompt_lower:
+        elif "size_medium" in flags:
             instance_class = "db.t3.medium"
-        
+
         components.append(
             ComponentSpec(
                 role=ComponentRole.DB_TIER,
@@ -217,8 +304,7 @@ def parse_nl_to_spec_rules(prompt: str) -> TopologySpec:
             )
     
     # If still no components but prompt looks like infrastructure request
-    infra_keywords = ["create", "build", "deploy", "setup", "provision", "launch", "make", "need", "want"]
-    if not components and any(kw in prompt_lower for kw in infra_keywords):
+    if not components and "infra" in flags:
         # Generic infrastructure request - default to web tier
         components.append(
             ComponentSpec(
@@ -236,63 +322,83 @@ def parse_nl_to_spec_rules(prompt: str) -> TopologySpec:
     )
 
 
-def _extract_quantity(text: str, keywords: list[str]) -> int:
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_NUM_TOKEN = r"(\d+|one|two|three|four|five|six|seven|eight|nine|ten)"
+
+
+@lru_cache(maxsize=None)
+def _quantity_patterns(
+    keywords: tuple[str, ...],
+) -> tuple[re.Pattern, list[tuple[re.Pattern, re.Pattern]]]:
+    """Compile the quantity patterns for a keyword tuple once."""
+    # Pattern: "create 2 servers", "2 web servers", etc.
+    general = re.compile(
+        r"(?:create|deploy|setup|add|with|need|want)?\s*" + _NUM_TOKEN
+        + r"\s+(?:web\s+)?(?:" + "|".join(keywords) + r")s?",
+        re.IGNORECASE,
+    )
+    per_keyword = [
+        # "N keyword" / "keyword: N" or "keyword (N)"
+        (re.compile(_NUM_TOKEN + rf"\s+{kw}s?"), re.compile(rf"{kw}s?\s*[:(\[]\s*(\d+)"))
+        for kw in keywords
+    ]
+    return general, per_keyword
+
+
+def _extract_quantity(text: str, keywords: tuple[str, ...]) -> int:
     """Extract quantity from text near keywords."""
     # Look for patterns like "3 servers", "two instances", etc.
-    number_words = {
-        "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-        "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
-    }
-    
+    general, per_keyword = _quantity_patterns(keywords)
+
     # First, try to find a number at the start of the text or after common words
-    # Pattern: "create 2 servers", "2 web servers", etc.
-    general_pattern = r"(?:create|deploy|setup|add|with|need|want)?\s*(\d+|one|two|three|four|five|six|seven|eight|nine|ten)\s+(?:web\s+)?(?:" + "|".join(keywords) + r")s?"
-    match = re.search(general_pattern, text, re.IGNORECASE)
+    match = general.search(text)
     if match:
         num_str = match.group(1).lower()
         if num_str.isdigit():
             return int(num_str)
-        return number_words.get(num_str, 1)
-    
-    for kw in keywords:
-        # Pattern: "N keyword" or "keyword N"
-        pattern = rf"(\d+|one|two|three|four|five|six|seven|eight|nine|ten)\s+{kw}s?"
-        match = re.search(pattern, text)
+        return _NUMBER_WORDS.get(num_str, 1)
+
+    for num_pattern, count_pattern in per_keyword:
+        match = num_pattern.search(text)
         if match:
             num_str = match.group(1)
             if num_str.isdigit():
                 return int(num_str)
-            return number_words.get(num_str, 1)
-        
-        # Pattern: "keyword: N" or "keyword (N)"
-        pattern = rf"{kw}s?\s*[:(\[]\s*(\d+)"
-        match = re.search(pattern, text)
+            return _NUMBER_WORDS.get(num_str, 1)
+
+        match = count_pattern.search(text)
         if match:
             return int(match.group(1))
-    
+
     return 1  # Default to 1
 
 
+# Role lookup by value; a dict miss is cheaper than the ValueError the
+# enum constructor raises for unknown roles
+_ROLE_MAP = {role.value: role for role in ComponentRole}
+
+
 def _dict_to_spec(spec_dict: dict[str, Any]) -> TopologySpec:
     """Convert a dictionary to TopologySpec."""
     components = []
     for comp in spec_dict.get("components", []):
-        role_str = comp.get("role", "other")
-        try:
-            role = ComponentRole(role_str)
-        except ValueError:
-            role = ComponentRole.OTHER
-        
+        role = _ROLE_MAP.get(comp.get("role", "other"), ComponentRole.OTHER)
+
+        # Shape is already enforced by the .get() defaults, so skip
+        # pydantic validation on construction
         components.append(
-            ComponentSpec(
+            ComponentSpec.model_construct(
                 role=role,
                 quantity=comp.get("quantity"),
                 description=comp.get("description", ""),
                 constraints=comp.get("constraints"),
             )
         )
-    
-    return TopologySpec(
+
+    return TopologySpec.model_construct(
         provider=spec_dict.get("provider", "aws"),
         region=spec_dict.get("region", "us-east-1"),
         components=components,
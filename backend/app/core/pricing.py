@@ -1,14 +1,28 @@
 # app/core/pricing.py
 """AWS Pricing estimation for topology resources."""
 
+import json
+import math
 import os
-from typing import Any
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
 
 import boto3
 from botocore.exceptions import ClientError
 
 from app.core.types import TopologyGraph, NodeKind
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # Fallback prices (us-east-1, on-demand, Linux) - used if API fails
 FALLBACK_EC2_PRICES = {
@@ -39,17 +53,115 @@ OTHER_COSTS = {
 }
 
 
-def get_ec2_price(instance_type: str, region: str = "us-east-1") -> float | None:
-    """Get EC2 on-demand price from AWS Pricing API."""
+def _extract_ondemand_usd(price_json: dict) -> float | None:
+    """Pull the on-demand USD rate out of a parsed PriceList entry.
+
+    A product can carry several price dimensions, some of them $0.00; take
+    the max of the non-zero candidates so ordering quirks don't matter.
+    """
+    prices = [
+        price
+        for term in price_json.get('terms', {}).get('OnDemand', {}).values()
+        for price_dimension in term.get('priceDimensions', {}).values()
+        if (price := float(price_dimension['pricePerUnit']['USD'])) > 0
+    ]
+    return max(prices) if prices else None
+
+
+@lru_cache(maxsize=1)
+def _pricing_client():
+    """Create the boto3 Pricing client once and reuse it across lookups."""
+    # Pricing API is only available in us-east-1 and ap-south-1
+    return boto3.client('pricing', region_name='us-east-1')
+
+
+# Persistent price cache: SKU prices change on the order of weeks, so a
+# day-old rate is fine for estimates and saves the API round-trip across
+# process restarts. Overridable via TOPNET_PRICE_CACHE; TTL in seconds.
+_PRICE_CACHE_TTL = int(os.environ.get("TOPNET_PRICE_CACHE_TTL", 86400))
+_price_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _price_cache_conn() -> sqlite3.Connection | None:
+    """Open (and initialize) the on-disk price cache, or None if unavailable."""
+    path = os.environ.get("TOPNET_PRICE_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "topnet", "pricing.sqlite"
+    )
     try:
-        # Pricing API is only available in us-east-1 and ap-south-1
-        pricing = boto3.client('pricing', region_name='us-east-1')
-        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS prices ("
+            " key TEXT PRIMARY KEY,"
+            " price REAL NOT NULL,"
+            " fetched_at INTEGER NOT NULL)"
+        )
+        conn.commit()
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        print(f"[pricing] Price cache unavailable: {e}")
+        return None
+
+
+def _cached_lookup(key: str, fetcher: Callable[[], float | None]) -> float | None:
+    """Look up a price in the on-disk cache, falling back to fetcher on miss.
+
+    Successful fetches are upserted; None results (API failures) are not
+    stored so the next process retries instead of caching the outage.
+    """
+    conn = _price_cache_conn()
+    if conn is None:
+        return fetcher()
+
+    now = int(time.time())
+    try:
+        with _price_cache_lock:
+            row = conn.execute(
+                "SELECT price, fetched_at FROM prices WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None and now - row[1] < _PRICE_CACHE_TTL:
+            return row[0]
+    except sqlite3.Error as e:
+        print(f"[pricing] Price cache read failed: {e}")
+
+    price = fetcher()
+    if price is not None:
+        try:
+            with _price_cache_lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO prices (key, price, fetched_at) VALUES (?, ?, ?)",
+                    (key, price, now),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[pricing] Price cache write failed: {e}")
+    return price
+
+
+@lru_cache(maxsize=512)
+def get_ec2_price(instance_type: str, location: str = "US East (N. Virginia)") -> float | None:
+    """Get EC2 on-demand price, via the on-disk cache then the Pricing API.
+
+    ``location`` is a Pricing API location name (see region_to_location).
+    """
+    return _cached_lookup(
+        f"ec2:{instance_type}:{location}",
+        lambda: _fetch_ec2_price(instance_type, location),
+    )
+
+
+def _fetch_ec2_price(instance_type: str, location: str) -> float | None:
+    """Fetch the EC2 on-demand rate from the AWS Pricing API."""
+    try:
+        pricing = _pricing_client()
+
         response = pricing.get_products(
             ServiceCode='AmazonEC2',
             Filters=[
                 {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region_to_location(region)},
+                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': location},
                 {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
                 {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
                 {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
@@ -58,78 +170,78 @@ def get_ec2_price(instance_type: str, region: str = "us-east-1") -> float | None
             MaxResults=1
         )
         
-        if response['PriceList']:
-            import json
-            price_data = json.loads(response['PriceList'][0])
-            terms = price_data.get('terms', {}).get('OnDemand', {})
-            for term in terms.values():
-                for price_dimension in term.get('priceDimensions', {}).values():
-                    price = float(price_dimension['pricePerUnit']['USD'])
-                    if price > 0:
-                        return price
-        
-        return None
+        if not response.get('PriceList'):
+            return None
+
+        return _extract_ondemand_usd(_json_loads(response['PriceList'][0]))
     except Exception as e:
         print(f"[pricing] Failed to get EC2 price: {e}")
         return None
 
 
-def get_rds_price(instance_class: str, engine: str, region: str = "us-east-1") -> float | None:
-    """Get RDS on-demand price from AWS Pricing API."""
+@lru_cache(maxsize=512)
+def get_rds_price(instance_class: str, engine: str, location: str = "US East (N. Virginia)") -> float | None:
+    """Get RDS on-demand price, via the on-disk cache then the Pricing API.
+
+    ``location`` is a Pricing API location name (see region_to_location).
+    """
+    return _cached_lookup(
+        f"rds:{instance_class}:{engine}:{location}",
+        lambda: _fetch_rds_price(instance_class, engine, location),
+    )
+
+
+def _fetch_rds_price(instance_class: str, engine: str, location: str) -> float | None:
+    """Fetch the RDS on-demand rate from the AWS Pricing API."""
     try:
-        pricing = boto3.client('pricing', region_name='us-east-1')
-        
+        pricing = _pricing_client()
+
         # Map engine names
         db_engine = "PostgreSQL" if engine == "postgres" else "MySQL"
-        
+
         response = pricing.get_products(
             ServiceCode='AmazonRDS',
             Filters=[
                 {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_class},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region_to_location(region)},
+                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': location},
                 {'Type': 'TERM_MATCH', 'Field': 'databaseEngine', 'Value': db_engine},
                 {'Type': 'TERM_MATCH', 'Field': 'deploymentOption', 'Value': 'Single-AZ'},
             ],
             MaxResults=1
         )
         
-        if response['PriceList']:
-            import json
-            price_data = json.loads(response['PriceList'][0])
-            terms = price_data.get('terms', {}).get('OnDemand', {})
-            for term in terms.values():
-                for price_dimension in term.get('priceDimensions', {}).values():
-                    price = float(price_dimension['pricePerUnit']['USD'])
-                    if price > 0:
-                        return price
-        
-        return None
+        if not response.get('PriceList'):
+            return None
+
+        return _extract_ondemand_usd(_json_loads(response['PriceList'][0]))
     except Exception as e:
         print(f"[pricing] Failed to get RDS price: {e}")
         return None
 
 
+_REGION_TO_LOCATION = {
+    "us-east-1": "US East (N. Virginia)",
+    "us-east-2": "US East (Ohio)",
+    "us-west-1": "US West (N. California)",
+    "us-west-2": "US West (Oregon)",
+    "ca-central-1": "Canada (Central)",
+    "eu-west-1": "EU (Ireland)",
+    "eu-west-2": "EU (London)",
+    "eu-west-3": "EU (Paris)",
+    "eu-central-1": "EU (Frankfurt)",
+    "eu-north-1": "EU (Stockholm)",
+    "ap-northeast-1": "Asia Pacific (Tokyo)",
+    "ap-northeast-2": "Asia Pacific (Seoul)",
+    "ap-southeast-1": "Asia Pacific (Singapore)",
+    "ap-southeast-2": "Asia Pacific (Sydney)",
+    "ap-south-1": "Asia Pacific (Mumbai)",
+    "sa-east-1": "South America (Sao Paulo)",
+}
+
+
 def region_to_location(region: str) -> str:
     """Convert AWS region code to pricing API location name."""
-    region_map = {
-        "us-east-1": "US East (N. Virginia)",
-        "us-east-2": "US East (Ohio)",
-        "us-west-1": "US West (N. California)",
-        "us-west-2": "US West (Oregon)",
-        "ca-central-1": "Canada (Central)",
-        "eu-west-1": "EU (Ireland)",
-        "eu-west-2": "EU (London)",
-        "eu-west-3": "EU (Paris)",
-        "eu-central-1": "EU (Frankfurt)",
-        "eu-north-1": "EU (Stockholm)",
-        "ap-northeast-1": "Asia Pacific (Tokyo)",
-        "ap-northeast-2": "Asia Pacific (Seoul)",
-        "ap-southeast-1": "Asia Pacific (Singapore)",
-        "ap-southeast-2": "Asia Pacific (Sydney)",
-        "ap-south-1": "Asia Pacific (Mumbai)",
-        "sa-east-1": "South America (Sao Paulo)",
-    }
-    return region_map.get(region, "US East (N. Virginia)")
+    return _REGION_TO_LOCATION.get(region, "US East (N. Virginia)")
 
 
 def estimate_topology_cost(topology: TopologyGraph) -> dict[str, Any]:
@@ -147,9 +259,37 @@ def estimate_topology_cost(topology: TopologyGraph) -> dict[str, Any]:
     region = "us-east-1"
     if topology.nodes:
         region = topology.nodes[0].region or "us-east-1"
-    
+    # Resolve the Pricing API location name once for the whole topology
+    location = region_to_location(region)
+
     hours_per_month = 730  # Average
-    
+
+    # Offline mode (CI, tests): skip the Pricing API entirely and price
+    # everything from the fallback tables.
+    offline = bool(os.environ.get("TOPNET_PRICING_OFFLINE"))
+
+    # Prefetch distinct SKUs in parallel so the per-node loop below hits the
+    # lru_cache instead of paying one Pricing API round-trip per node.
+    if not offline:
+        ec2_keys = set()
+        rds_keys = set()
+        for node in topology.nodes:
+            if node.kind == NodeKind.COMPUTE_INSTANCE:
+                ec2_keys.add((node.props.get("instance_type", "t3.micro"), location))
+            elif node.kind == NodeKind.DATABASE:
+                rds_keys.add((
+                    node.props.get("instance_class", "db.t3.micro"),
+                    node.props.get("engine", "postgres"),
+                    location,
+                ))
+
+        if len(ec2_keys) + len(rds_keys) > 1:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                for key in ec2_keys:
+                    executor.submit(get_ec2_price, *key)
+                for key in rds_keys:
+                    executor.submit(get_rds_price, *key)
+
     for node in topology.nodes:
         item = None
         
@@ -157,7 +297,7 @@ def estimate_topology_cost(topology: TopologyGraph) -> dict[str, Any]:
             instance_type = node.props.get("instance_type", "t3.micro")
             
             # Try API first, fall back to hardcoded
-            hourly = get_ec2_price(instance_type, region)
+            hourly = None if offline else get_ec2_price(instance_type, location)
             if hourly is None:
                 hourly = FALLBACK_EC2_PRICES.get(instance_type, 0.0104)
             
@@ -173,7 +313,7 @@ def estimate_topology_cost(topology: TopologyGraph) -> dict[str, Any]:
             engine = node.props.get("engine", "postgres")
             
             # Try API first, fall back to hardcoded
-            hourly = get_rds_price(instance_class, engine, region)
+            hourly = None if offline else get_rds_price(instance_class, engine, location)
             if hourly is None:
                 hourly = FALLBACK_RDS_PRICES.get(instance_class, 0.017)
             
@@ -206,12 +346,10 @@ def estimate_topology_cost(topology: TopologyGraph) -> dict[str, Any]:
         
         if item:
             costs["items"].append(item)
-            costs["hourly_total"] += item["hourly"]
-            costs["monthly_total"] += item["monthly"]
-    
-    # Round totals
-    costs["hourly_total"] = round(costs["hourly_total"], 4)
-    costs["monthly_total"] = round(costs["monthly_total"], 2)
+
+    # Total once after the loop; fsum keeps the rounding exact
+    costs["hourly_total"] = round(math.fsum(i["hourly"] for i in costs["items"]), 4)
+    costs["monthly_total"] = round(math.fsum(i["monthly"] for i in costs["items"]), 2)
     
     # Add free tier note if applicable
     if costs["monthly_total"] < 20:
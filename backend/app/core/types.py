@@ -35,6 +35,10 @@ class EdgeKind(str, Enum):
     CONTAINS = "contains"
 
 
+# BaseNode/Edge stay pydantic models (not slotted dataclasses): they are
+# validated and serialized by the FastAPI layer, and pydantic v2 stores
+# fields in __dict__ with no slots option. The builder instead skips
+# validation via model_construct for internally generated instances.
 class BaseNode(BaseModel):
     """A node in the topology graph."""
 
@@ -2,6 +2,8 @@
 """Generate Terraform JSON for AWS resources from TopologyGraph."""
 
 import json
+from collections import defaultdict
+from functools import lru_cache
 from typing import Any
 
 from app.core import TopologyGraph, BaseNode, NodeKind
@@ -12,8 +14,12 @@ class TerraformGenerator:
     
     def __init__(self, graph: TopologyGraph):
         self.graph = graph
-        self.resources: dict[str, Any] = {}
-        
+        # defaultdict saves the "ensure type key exists" probe in every _add_*
+        self.resources: dict[str, dict[str, Any]] = defaultdict(dict)
+
+        # Index nodes by ID once so edge resolution is O(1) per lookup
+        self.nodes_by_id = {node.id: node for node in graph.nodes}
+
         # Find VPC and IGW node IDs for references
         self.vpc_id = self._find_node_id(NodeKind.NETWORK)
         self.igw_id = self._find_igw_id()
@@ -83,7 +89,10 @@ class TerraformGenerator:
         
         # Add route table associations (must be done after route tables are created)
         self._add_route_table_associations()
-        
+
+        # Hand serializers a plain dict (and drop defaultdict's autovivify)
+        terraform_config["resource"] = dict(self.resources)
+
         return terraform_config
     
     def _get_region(self) -> str:
@@ -95,9 +104,6 @@ class TerraformGenerator:
     
     def _add_vpc(self, node: BaseNode) -> None:
         """Add aws_vpc resource."""
-        if "aws_vpc" not in self.resources:
-            self.resources["aws_vpc"] = {}
-        
         name = _sanitize_name(node.id)
         self.resources["aws_vpc"][name] = {
             "cidr_block": node.props.get("cidr_block", "10.0.0.0/16"),
@@ -108,9 +114,6 @@ class TerraformGenerator:
     
     def _add_subnet(self, node: BaseNode) -> None:
         """Add aws_subnet resource."""
-        if "aws_subnet" not in self.resources:
-            self.resources["aws_subnet"] = {}
-        
         name = _sanitize_name(node.id)
         self.resources["aws_subnet"][name] = {
             "vpc_id": self._vpc_ref(),
@@ -125,9 +128,6 @@ class TerraformGenerator:
         gateway_type = node.props.get("gateway_type", "internet")
         
         if gateway_type == "internet":
-            if "aws_internet_gateway" not in self.resources:
-                self.resources["aws_internet_gateway"] = {}
-            
             name = _sanitize_name(node.id)
             self.resources["aws_internet_gateway"][name] = {
                 "vpc_id": self._vpc_ref(),
@@ -135,11 +135,6 @@ class TerraformGenerator:
             }
         elif gateway_type == "nat":
             # NAT Gateway needs an EIP
-            if "aws_eip" not in self.resources:
-                self.resources["aws_eip"] = {}
-            if "aws_nat_gateway" not in self.resources:
-                self.resources["aws_nat_gateway"] = {}
-            
             name = _sanitize_name(node.id)
             eip_name = f"{name}_eip"
             
@@ -160,11 +155,6 @@ class TerraformGenerator:
     
     def _add_route_table(self, node: BaseNode) -> None:
         """Add aws_route_table resource and separate aws_route resources."""
-        if "aws_route_table" not in self.resources:
-            self.resources["aws_route_table"] = {}
-        if "aws_route" not in self.resources:
-            self.resources["aws_route"] = {}
-        
         name = _sanitize_name(node.id)
         
         # Create route table without inline routes
@@ -198,8 +188,8 @@ class TerraformGenerator:
         for edge in self.graph.edges:
             if edge.kind == "attached_to":
                 # Check if this is a route table -> subnet association
-                from_node = next((n for n in self.graph.nodes if n.id == edge.from_node), None)
-                to_node = next((n for n in self.graph.nodes if n.id == edge.to_node), None)
+                from_node = self.nodes_by_id.get(edge.from_node)
+                to_node = self.nodes_by_id.get(edge.to_node)
                 
                 if from_node and to_node:
                     if from_node.kind == NodeKind.ROUTE_TABLE and to_node.kind == NodeKind.SUBNET:
@@ -216,11 +206,6 @@ class TerraformGenerator:
     
     def _add_security_group(self, node: BaseNode) -> None:
         """Add aws_security_group resource and separate rule resources."""
-        if "aws_security_group" not in self.resources:
-            self.resources["aws_security_group"] = {}
-        if "aws_security_group_rule" not in self.resources:
-            self.resources["aws_security_group_rule"] = {}
-        
         name = _sanitize_name(node.id)
         
         # Create security group without inline rules
@@ -277,13 +262,6 @@ class TerraformGenerator:
     
     def _add_alb(self, node: BaseNode) -> None:
         """Add aws_lb, aws_lb_target_group, and aws_lb_listener resources."""
-        if "aws_lb" not in self.resources:
-            self.resources["aws_lb"] = {}
-        if "aws_lb_target_group" not in self.resources:
-            self.resources["aws_lb_target_group"] = {}
-        if "aws_lb_listener" not in self.resources:
-            self.resources["aws_lb_listener"] = {}
-        
         name = _sanitize_name(node.id)
         
         # Get subnet references
@@ -331,9 +309,6 @@ class TerraformGenerator:
     
     def _add_ec2(self, node: BaseNode) -> None:
         """Add aws_instance resource."""
-        if "aws_instance" not in self.resources:
-            self.resources["aws_instance"] = {}
-        
         name = _sanitize_name(node.id)
         
         # Get subnet reference
@@ -372,13 +347,6 @@ class TerraformGenerator:
         """Add aws_db_subnet_group and aws_db_instance resources."""
         from app.core import BaseNode as BNode, NodeKind as NK, Provider
 
-        if "aws_db_subnet_group" not in self.resources:
-            self.resources["aws_db_subnet_group"] = {}
-        if "aws_db_instance" not in self.resources:
-            self.resources["aws_db_instance"] = {}
-        if "aws_subnet" not in self.resources:
-            self.resources["aws_subnet"] = {}
-
         name = _sanitize_name(node.id)
 
         # Find all database subnets for the subnet group
@@ -425,6 +393,7 @@ class TerraformGenerator:
                     tags={"Name": f"topnet-auto-{second_subnet_id}", "ManagedBy": "TopNet", "AutoCreated": "true"},
                 )
                 self.graph.nodes.append(second_subnet)
+                self.nodes_by_id[second_subnet_id] = second_subnet
 
                 # Add Terraform resource for second subnet
                 subnet_tf_name = _sanitize_name(second_subnet_id)
@@ -472,6 +441,7 @@ class TerraformGenerator:
         }
 
 
+@lru_cache(maxsize=4096)
 def _sanitize_name(name: str) -> str:
     """Convert node ID to valid Terraform resource name."""
     return name.replace("-", "_")
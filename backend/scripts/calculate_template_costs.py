@@ -7,12 +7,19 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.pricing import estimate_topology_cost, get_ec2_price, get_rds_price, OTHER_COSTS
+from app.core.pricing import (
+    estimate_topology_cost,
+    get_ec2_price,
+    get_rds_price,
+    region_to_location,
+    OTHER_COSTS,
+)
 
 def calculate_template_costs():
     """Calculate costs for each template."""
 
     region = "us-east-2"  # Ohio - our default region
+    location = region_to_location(region)  # price getters key on location names
     hours_per_month = 730
 
     templates = {
@@ -65,7 +72,7 @@ def calculate_template_costs():
 
         # EC2 instances
         for instance_type, count in config["ec2"]:
-            price = get_ec2_price(instance_type, region)
+            price = get_ec2_price(instance_type, location)
             if price is None:
                 print(f"⚠️  Warning: Could not fetch price for {instance_type}, using fallback")
                 from app.core.pricing import FALLBACK_EC2_PRICES
@@ -77,7 +84,7 @@ def calculate_template_costs():
 
         # RDS databases
         for instance_class, engine, count in config["rds"]:
-            price = get_rds_price(instance_class, engine, region)
+            price = get_rds_price(instance_class, engine, location)
             if price is None:
                 print(f"⚠️  Warning: Could not fetch price for {instance_class} {engine}, using fallback")
                 from app.core.pricing import FALLBACK_RDS_PRICES